@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Shared build configuration for setup_original.py and setup_simple.py
+"""
+
+from pybind11.setup_helpers import Pybind11Extension
+import pybind11
+import subprocess
+import functools
+
+@functools.lru_cache(maxsize=None)
+def get_opencv_flags():
+    """Get OpenCV compiler and linker flags from a single pkg-config call"""
+    try:
+        flags = subprocess.check_output(['pkg-config', 'opencv4', '--cflags', '--libs']).decode('utf-8').split()
+    except (OSError, subprocess.CalledProcessError):
+        # Fallback to manual paths
+        return ['-I/usr/include/opencv4'], ['-lopencv_core', '-lopencv_imgproc', '-lopencv_highgui', '-lopencv_imgcodecs']
+
+    # pkg-config prints the compiler flags first; split the linker flags back out
+    cflags = [flag for flag in flags if not flag.startswith(('-l', '-L', '-Wl,'))]
+    libs = [flag for flag in flags if flag.startswith(('-l', '-L', '-Wl,'))]
+    return cflags, libs
+
+def make_extension(name, sources, extra_defines=(), **kwargs):
+    """Build the Pybind11Extension shared by the Linux setup scripts
+
+    Linking options (libraries, extra_objects, library_dirs, ...) differ
+    between the scripts and are passed through as keyword arguments.
+    """
+    opencv_cflags, opencv_libs = get_opencv_flags()
+
+    return Pybind11Extension(
+        name,
+        sources=list(sources),
+        include_dirs=[
+            # Path to pybind11 headers
+            pybind11.get_include(),
+            # Local include directory
+            "./include",
+            ".",
+        ] + [flag[2:] for flag in opencv_cflags if flag.startswith('-I')],  # Extract -I paths
+
+        language='c++',
+        cxx_std=11,
+
+        define_macros=[
+            ("IMAGE_AND_TEMP_OUTPUT", None),  # Enable both image and temperature output
+            ("linux", None),
+        ] + list(extra_defines),
+
+        extra_compile_args=[
+            "-O3",
+            "-Wall",
+        ] + [flag for flag in opencv_cflags if not flag.startswith('-I')],
+
+        **kwargs
+    )
+
+# setup() arguments common to both scripts
+SETUP_METADATA = dict(
+    version="1.0.0",
+    author="Thermal Camera Python Bindings",
+    author_email="",
+    description="Simplified Python bindings for P2/Tiny1C thermal camera SDK",
+    long_description="""
+    Simplified Python bindings for the AC010_256 thermal camera SDK.
+    Supports P2/Tiny1C thermal cameras with basic functionality.
+    
+    Features:
+    - Basic camera control (open/close, start/stop streaming)
+    - Raw frame acquisition
+    - Basic temperature processing
+    - NumPy array integration
+    """,
+    extras_require={"test": "pytest"},
+    zip_safe=False,
+    python_requires=">=3.6",
+    install_requires=[
+        "numpy>=1.15.0",
+    ],
+    classifiers=[
+        "Development Status :: 3 - Alpha",
+        "Intended Audience :: Developers",
+        "Programming Language :: Python :: 3",
+        "Programming Language :: Python :: 3.6",
+        "Programming Language :: Python :: 3.7",
+        "Programming Language :: Python :: 3.8",
+        "Programming Language :: Python :: 3.9",
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
+        "Topic :: Scientific/Engineering",
+        "Topic :: Software Development :: Libraries :: Python Modules",
+    ],
+)
@@ -4,46 +4,128 @@ Check DLL dependencies using Python
 """
 
 import os
+import sys
+import mmap
 import struct
 import ctypes
+import ctypes.util
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from ctypes import wintypes
 
+# Thermal camera DLL directory, relative to the repository root
+THERMAL_DLL_DIR = "./libs/win/x64/dll"
+
+# Common dependencies that thermal camera DLLs might need
+COMMON_DEPS = [
+    'msvcr120.dll',    # Visual C++ 2013 runtime
+    'msvcp120.dll',    # Visual C++ 2013 runtime  
+    'msvcr140.dll',    # Visual C++ 2015-2022 runtime
+    'msvcp140.dll',    # Visual C++ 2015-2022 runtime
+    'vcruntime140.dll', # Visual C++ 2015-2022 runtime
+    'vcruntime140_1.dll', # Visual C++ 2015-2022 runtime
+    'libusb-1.0.dll',  # USB library
+    'pthreadVC2.dll',  # pthread library
+    'kernel32.dll',    # System
+    'user32.dll',      # System
+    'advapi32.dll',    # System
+    'ws2_32.dll',      # Winsock
+    'winusb.dll',      # Windows USB
+    'setupapi.dll',    # Setup API
+]
+
+# Lowercased for case-insensitive matching against directory listings
+_COMMON_DEPS = frozenset(name.lower() for name in COMMON_DEPS)
+
+# DLL handles loaded so far, keyed by lowercased name
+_loaded_dlls = {}
+
+def _load_dll(dll_name):
+    """Load a DLL once and reuse the handle on later calls"""
+    key = dll_name.lower()
+    dll = _loaded_dlls.get(key)
+    if dll is None:
+        dll = ctypes.CDLL(dll_name)
+        _loaded_dlls[key] = dll
+    return dll
+
+@functools.lru_cache(maxsize=None)
+def _known_dll_locations():
+    """Map lowercased common-dependency names to the directory they were found in.
+    
+    Lists System32 and the thermal DLL directory once, so most lookups
+    don't need to go through the Windows loader at all.
+    """
+    search_dirs = [THERMAL_DLL_DIR]
+    system_root = os.environ.get('SystemRoot')
+    if system_root:
+        search_dirs.append(os.path.join(system_root, 'System32'))
+    
+    locations = {}
+    for directory in search_dirs:
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        for name in names:
+            lowered = name.lower()
+            if lowered in _COMMON_DEPS:
+                locations.setdefault(lowered, directory)
+    return locations
+
+def _write_lines(lines):
+    """Emit buffered report lines with a single write"""
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+
 def get_dll_imports(dll_path):
     """Extract imported DLLs from a PE file"""
     try:
-        with open(dll_path, 'rb') as f:
-            # Read DOS header
-            dos_header = f.read(64)
-            if dos_header[:2] != b'MZ':
+        with open(dll_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Check DOS header
+            if mm[:2] != b'MZ':
                 print("Not a valid PE file")
                 return []
             
             # Get PE header offset
-            pe_offset = struct.unpack('<I', dos_header[60:64])[0]
-            f.seek(pe_offset)
+            pe_offset = struct.unpack_from('<I', mm, 60)[0]
             
-            # Read PE signature
-            pe_sig = f.read(4)
-            if pe_sig != b'PE\x00\x00':
+            # Check PE signature
+            if mm[pe_offset:pe_offset + 4] != b'PE\x00\x00':
                 print("Invalid PE signature")
                 return []
             
-            # Read COFF header
-            f.read(20)  # Skip COFF header
+            # COFF header: Machine, NumberOfSections, TimeDateStamp,
+            # PointerToSymbolTable, NumberOfSymbols, SizeOfOptionalHeader, Characteristics
+            coff_header = struct.unpack_from('<HHIIIHH', mm, pe_offset + 4)
+            opt_header_size = coff_header[5]
+            opt_header_offset = pe_offset + 24
             
-            # Read optional header size
-            opt_header_size = struct.unpack('<H', f.read(2))[0]
-            f.seek(-2, 1)  # Go back
+            # Optional header magic tells PE32 (0x10b) from PE32+ (0x20b)
+            magic = struct.unpack_from('<H', mm, opt_header_offset)[0]
+            if magic == 0x10b:
+                data_dir_offset = 96
+            elif magic == 0x20b:
+                data_dir_offset = 112
+            else:
+                print(f"Unknown optional header magic: 0x{magic:x}")
+                return []
             
-            # Read optional header
-            opt_header = f.read(opt_header_size)
-            if len(opt_header) < 96:
+            # Import table is data directory entry 1 (8 bytes: RVA, size)
+            import_entry_offset = data_dir_offset + 8
+            if opt_header_size < import_entry_offset + 8:
                 print("Optional header too short")
                 return []
             
-            # Get import table RVA and size
-            import_table_rva = struct.unpack('<I', opt_header[88:92])[0]
-            import_table_size = struct.unpack('<I', opt_header[92:96])[0]
+            # NumberOfRvaAndSizes immediately precedes the data directories
+            num_data_dirs = struct.unpack_from('<I', mm, opt_header_offset + data_dir_offset - 4)[0]
+            if num_data_dirs < 2:
+                print("No import table")
+                return []
+            
+            import_table_rva, import_table_size = struct.unpack_from(
+                '<II', mm, opt_header_offset + import_entry_offset)
             
             if import_table_rva == 0:
                 print("No import table")
@@ -60,69 +142,85 @@ def get_dll_imports(dll_path):
 
 def check_common_dependencies():
     """Check for common DLL dependencies that might be missing"""
-    print("\n=== Checking Common Dependencies ===\n")
-    
-    # Common dependencies that thermal camera DLLs might need
-    common_deps = [
-        'msvcr120.dll',    # Visual C++ 2013 runtime
-        'msvcp120.dll',    # Visual C++ 2013 runtime  
-        'msvcr140.dll',    # Visual C++ 2015-2022 runtime
-        'msvcp140.dll',    # Visual C++ 2015-2022 runtime
-        'vcruntime140.dll', # Visual C++ 2015-2022 runtime
-        'vcruntime140_1.dll', # Visual C++ 2015-2022 runtime
-        'libusb-1.0.dll',  # USB library
-        'pthreadVC2.dll',  # pthread library
-        'kernel32.dll',    # System
-        'user32.dll',      # System
-        'advapi32.dll',    # System
-        'ws2_32.dll',      # Winsock
-        'winusb.dll',      # Windows USB
-        'setupapi.dll',    # Setup API
-    ]
+    lines = ["\n=== Checking Common Dependencies ===\n"]
+    known_dlls = _known_dll_locations()
     
-    for dll_name in common_deps:
+    for dll_name in COMMON_DEPS:
+        # Cheap directory lookup first; only fall back to the loader on a miss
+        location = known_dlls.get(dll_name.lower())
+        if location:
+            lines.append(f"[OK] {dll_name} - Found in {location}")
+            continue
+        
         try:
             # Try to load the DLL
-            dll = ctypes.CDLL(dll_name)
-            print(f"[OK] {dll_name} - Available")
+            _load_dll(dll_name)
+            lines.append(f"[OK] {dll_name} - Available")
         except OSError:
             # Try to find it in system paths
             dll_path = ctypes.util.find_library(dll_name.replace('.dll', ''))
             if dll_path:
-                print(f"[OK] {dll_name} - Found at {dll_path}")
+                lines.append(f"[OK] {dll_name} - Found at {dll_path}")
             else:
-                print(f"[MISSING] {dll_name} - Not found")
+                lines.append(f"[MISSING] {dll_name} - Not found")
+    
+    _write_lines(lines)
+
+def _try_load_dll(dll_path):
+    """Return the load error for a DLL, or None if it loads"""
+    try:
+        ctypes.CDLL(dll_path)
+        return None
+    except OSError as e:
+        return e
 
 def check_falcon_app_deps():
     """Check what dependencies the original FalconApplication has"""
-    print("\n=== Checking FalconApplication Dependencies ===\n")
+    lines = ["\n=== Checking FalconApplication Dependencies ===\n"]
     
     falcon_dir = r"C:\Users\mail\dev\personal\Tiny 1c windows 上位机 FalconApplication_0.10.6\FalconApplication_0.10.6"
     
     if not os.path.exists(falcon_dir):
-        print("FalconApplication directory not found")
+        lines.append("FalconApplication directory not found")
+        _write_lines(lines)
         return
     
-    # List all DLLs in the FalconApplication directory
-    dll_files = [f for f in os.listdir(falcon_dir) if f.endswith('.dll')]
+    # List all DLLs in the FalconApplication directory; on Windows the
+    # DirEntry stat comes from the directory listing, so no extra syscall per file
+    with os.scandir(falcon_dir) as it:
+        dll_entries = sorted((e for e in it if e.name.lower().endswith('.dll')), key=lambda e: e.name)
+    if not dll_entries:
+        lines.append("No DLLs found in FalconApplication")
+        _write_lines(lines)
+        return
     
-    print("DLLs found in FalconApplication:")
-    for dll in sorted(dll_files):
-        dll_path = os.path.join(falcon_dir, dll)
-        size = os.path.getsize(dll_path)
-        print(f"  {dll} ({size:,} bytes)")
+    # Loading is mostly kernel work with the GIL released, so probe in parallel
+    with ThreadPoolExecutor(max_workers=min(16, len(dll_entries))) as executor:
+        results = executor.map(_try_load_dll, (e.path for e in dll_entries))
         
-        # Try to load each DLL to see which ones work
-        try:
-            ctypes.CDLL(dll_path)
-            print(f"    [CAN LOAD] {dll}")
-        except OSError as e:
-            print(f"    [CANNOT LOAD] {dll}: {e}")
+        lines.append("DLLs found in FalconApplication:")
+        for entry, error in zip(dll_entries, results):
+            dll = entry.name
+            lines.append(f"  {dll} ({entry.stat().st_size:,} bytes)")
+            if error is None:
+                lines.append(f"    [CAN LOAD] {dll}")
+            else:
+                lines.append(f"    [CANNOT LOAD] {dll}: {error}")
+    
+    _write_lines(lines)
 
 def test_with_falcon_path():
     """Test loading our thermal DLLs with FalconApplication in PATH"""
     print("\n=== Testing with FalconApplication in PATH ===\n")
     
+    # Nothing to fix if the extension already loads without touching PATH
+    try:
+        import tiny_thermal_camera
+        print("[SKIP] Python extension already loads - PATH change not needed")
+        return
+    except ImportError:
+        pass
+    
     falcon_dir = r"C:\Users\mail\dev\personal\Tiny 1c windows 上位机 FalconApplication_0.10.6\FalconApplication_0.10.6"
     
     if not os.path.exists(falcon_dir):
@@ -9,9 +9,24 @@ import ctypes
 import ctypes.util
 from pathlib import Path
 
+# Resolve and prototype SetDllDirectoryW once instead of on every call
+if sys.platform == 'win32':
+    import ctypes.wintypes
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _SetDllDirectoryW = _kernel32.SetDllDirectoryW
+    _SetDllDirectoryW.argtypes = [ctypes.wintypes.LPCWSTR]
+    _SetDllDirectoryW.restype = ctypes.wintypes.BOOL
+else:
+    _SetDllDirectoryW = None
+
+def _write_lines(lines):
+    """Emit buffered report lines with a single write"""
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+
 def test_dll_loading():
     """Test loading the thermal camera DLLs directly"""
-    print("=== DLL Loading Debug ===\n")
+    lines = ["=== DLL Loading Debug ===\n"]
     
     # DLL locations to test
     dll_locations = [
@@ -23,51 +38,53 @@ def test_dll_loading():
     dll_names = ["libiruvc.dll", "libirtemp.dll", "libirprocess.dll", "libirparse.dll"]
     
     for location in dll_locations:
-        print(f"\n--- Testing location: {location} ---")
+        lines.append(f"\n--- Testing location: {location} ---")
         if not os.path.exists(location):
-            print(f"[SKIP] Directory does not exist")
+            lines.append(f"[SKIP] Directory does not exist")
             continue
             
         for dll_name in dll_names:
             dll_path = os.path.join(location, dll_name)
-            print(f"\nTesting: {dll_path}")
+            lines.append(f"\nTesting: {dll_path}")
             
             if not os.path.exists(dll_path):
-                print(f"  [MISSING] File does not exist")
+                lines.append(f"  [MISSING] File does not exist")
                 continue
                 
-            print(f"  [EXISTS] File found")
+            lines.append(f"  [EXISTS] File found")
             
             # Get file info
             stat = os.stat(dll_path)
-            print(f"  [SIZE] {stat.st_size} bytes")
+            lines.append(f"  [SIZE] {stat.st_size} bytes")
             
             # Try to load with ctypes
             try:
                 dll = ctypes.CDLL(dll_path)
-                print(f"  [SUCCESS] Loaded with ctypes.CDLL")
+                lines.append(f"  [SUCCESS] Loaded with ctypes.CDLL")
                 
                 # Try to get a function we know should exist
                 if dll_name == "libiruvc.dll":
                     try:
                         func = dll.uvc_camera_init
-                        print(f"  [SUCCESS] Found uvc_camera_init function")
+                        lines.append(f"  [SUCCESS] Found uvc_camera_init function")
                     except AttributeError:
-                        print(f"  [WARNING] uvc_camera_init function not found")
+                        lines.append(f"  [WARNING] uvc_camera_init function not found")
                         
             except OSError as e:
-                print(f"  [ERROR] Failed to load: {e}")
+                lines.append(f"  [ERROR] Failed to load: {e}")
                 
                 # Try to get more specific error info
                 try:
                     error_code = ctypes.get_last_error()
-                    print(f"  [ERROR CODE] {error_code}")
+                    lines.append(f"  [ERROR CODE] {error_code}")
                 except:
                     pass
+    
+    _write_lines(lines)
 
 def test_python_extension():
     """Test loading the Python extension directly"""
-    print("\n=== Python Extension Loading Debug ===\n")
+    lines = ["\n=== Python Extension Loading Debug ===\n"]
     
     extension_paths = [
         "./tiny_thermal_camera.cp312-win_amd64.pyd",
@@ -75,20 +92,22 @@ def test_python_extension():
     ]
     
     for ext_path in extension_paths:
-        print(f"\nTesting extension: {ext_path}")
+        lines.append(f"\nTesting extension: {ext_path}")
         
         if not os.path.exists(ext_path):
-            print(f"  [MISSING] Extension does not exist")
+            lines.append(f"  [MISSING] Extension does not exist")
             continue
             
-        print(f"  [EXISTS] Extension found")
+        lines.append(f"  [EXISTS] Extension found")
         
         # Try loading as DLL first to see dependencies
         try:
             dll = ctypes.CDLL(ext_path)
-            print(f"  [SUCCESS] Extension loaded as DLL")
+            lines.append(f"  [SUCCESS] Extension loaded as DLL")
         except OSError as e:
-            print(f"  [ERROR] Failed to load extension as DLL: {e}")
+            lines.append(f"  [ERROR] Failed to load extension as DLL: {e}")
+    
+    _write_lines(lines)
 
 def check_dll_dependencies():
     """Check what dependencies the DLLs have"""
@@ -134,22 +153,24 @@ def test_path_methods():
         print("DLL directory does not exist!")
         return
     
-    # Method 1: Add to PATH
-    print("\n1. Testing PATH method...")
-    original_path = os.environ.get('PATH', '')
-    try:
-        if dll_dir not in original_path:
-            os.environ['PATH'] = dll_dir + os.pathsep + original_path
-            print(f"Added to PATH: {dll_dir}")
-        
-        # Try loading extension
+    # Method 1: Add to PATH (superseded by add_dll_directory on Python 3.8+)
+    if not hasattr(os, 'add_dll_directory'):
+        print("\n1. Testing PATH method...")
+        original_path = os.environ.get('PATH', '')
         try:
-            import tiny_thermal_camera
-            print("SUCCESS: Extension loaded with PATH method")
-        except ImportError as e:
-            print(f"FAILED: {e}")
-    finally:
-        os.environ['PATH'] = original_path
+            os.environ['PATH'] = os.pathsep.join((dll_dir, original_path))
+            print(f"Added to PATH: {dll_dir}")
+            
+            # Try loading extension
+            try:
+                import tiny_thermal_camera
+                print("SUCCESS: Extension loaded with PATH method")
+            except ImportError as e:
+                print(f"FAILED: {e}")
+        finally:
+            os.environ['PATH'] = original_path
+    else:
+        print("\n1. Skipping PATH method (add_dll_directory available)")
     
     # Method 2: os.add_dll_directory (Python 3.8+)
     if hasattr(os, 'add_dll_directory'):
@@ -170,9 +191,11 @@ def test_path_methods():
     
     # Method 3: SetDllDirectory
     print("\n3. Testing SetDllDirectory method...")
+    if _SetDllDirectoryW is None:
+        print("SetDllDirectory not available on this platform")
+        return
     try:
-        kernel32 = ctypes.windll.kernel32
-        result = kernel32.SetDllDirectoryW(dll_dir)
+        result = _SetDllDirectoryW(dll_dir)
         if result:
             print(f"SetDllDirectory succeeded: {dll_dir}")
             
@@ -185,12 +208,22 @@ def test_path_methods():
             print("SetDllDirectory failed")
             
         # Reset
-        kernel32.SetDllDirectoryW(None)
+        _SetDllDirectoryW(None)
     except Exception as e:
         print(f"SetDllDirectory method failed: {e}")
 
 def main():
     """Run all debugging tests"""
+    # Fast path: if the extension already imports there is nothing to debug
+    if '--force' not in sys.argv[1:]:
+        try:
+            import tiny_thermal_camera
+            print("[OK] tiny_thermal_camera imports successfully - skipping DLL probes")
+            print("Run with --force to probe anyway")
+            return
+        except ImportError as e:
+            print(f"tiny_thermal_camera import failed: {e}")
+    
     test_dll_loading()
     check_dll_dependencies() 
     test_python_extension()
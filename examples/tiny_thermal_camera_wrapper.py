@@ -9,39 +9,117 @@ Handles DLL loading on Windows automatically.
 import numpy as np
 import time
 import os
+import math
+import functools
 import platform
 from typing import Tuple, Optional, Union
 
+# Numba is optional; without it frame scans fall back to NumPy reductions
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Raw temperature encoding used by the sensor: 1/64 Kelvin per count.
+# Must stay in sync with TemperatureProcessor::temp_to_celsius in the C++ extension.
+TEMP_SCALE = 64.0
+KELVIN_OFFSET = 273.15
+
+# Raw uint16 -> Celsius lookup table (256 KB); conversion becomes a single gather
+_CELSIUS_LUT = (np.arange(65536) / TEMP_SCALE - KELVIN_OFFSET).astype(np.float32)
+
+def _raw_to_celsius(raw_value: float) -> float:
+    """Convert a single raw temperature value to Celsius"""
+    return raw_value / TEMP_SCALE - KELVIN_OFFSET
+
+def _convert_to_celsius(temp_frame: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Convert a raw temperature frame to a float32 Celsius array"""
+    if temp_frame.dtype == np.uint16:
+        # Every uint16 is a valid LUT index, so skip take()'s bounds checking
+        return np.take(_CELSIUS_LUT, temp_frame, out=out, mode='clip')
+    
+    celsius = np.multiply(temp_frame, 1.0 / TEMP_SCALE, out=out, dtype=np.float32)
+    return np.subtract(celsius, KELVIN_OFFSET, out=celsius)
+
+if njit is not None:
+    @njit(cache=True)
+    def _scan_raw_frame(raw):
+        """Single pass over a flat uint16 frame: (argmin, argmax, sum, sum of squares)"""
+        min_idx = 0
+        max_idx = 0
+        min_val = raw[0]
+        max_val = raw[0]
+        total = np.uint64(0)
+        total_sq = np.uint64(0)
+        for i in range(raw.size):
+            value = raw[i]
+            if value < min_val:
+                min_val = value
+                min_idx = i
+            if value > max_val:
+                max_val = value
+                max_idx = i
+            wide = np.uint64(value)
+            total += wide
+            total_sq += wide * wide
+        return min_idx, max_idx, total, total_sq
+else:
+    def _scan_raw_frame(raw):
+        """NumPy fallback: (argmin, argmax, sum, sum of squares) of a flat uint16 frame"""
+        return (np.argmin(raw), np.argmax(raw), raw.sum(dtype=np.uint64),
+                np.einsum('i,i->', raw, raw, dtype=np.uint64))
+
+# Set once the DLL directory has been registered for this process
+_DLL_PATH_SET = False
+# Handle returned by os.add_dll_directory; kept so the directory stays registered
+_dll_directory_cookie = None
+# Directories this module has already prepended to PATH
+_PATH_DIRS_ADDED = set()
+
+@functools.lru_cache(maxsize=None)
+def _get_dll_dir(system: str, machine: str) -> Optional[str]:
+    """Resolve the bundled DLL directory for a platform, or None if not Windows"""
+    if system.lower() != 'windows':
+        return None
+    
+    # Get the directory of this module
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    
+    # Determine architecture
+    if machine.endswith('64'):
+        return os.path.join(module_dir, 'libs', 'win', 'x64', 'dll')
+    return os.path.join(module_dir, 'libs', 'win', 'Win32', 'dll')
+
 def _setup_dll_path():
-    """Add DLL directory to PATH on Windows"""
-    if platform.system().lower() == 'windows':
-        # Get the directory of this module
-        module_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        # Determine architecture
-        is_64bit = platform.machine().endswith('64')
-        
-        if is_64bit:
-            dll_dir = os.path.join(module_dir, 'libs', 'win', 'x64', 'dll')
-        else:
-            dll_dir = os.path.join(module_dir, 'libs', 'win', 'Win32', 'dll')
-        
-        if os.path.exists(dll_dir):
+    """Add DLL directory to the search path on Windows (once per process)"""
+    global _DLL_PATH_SET, _dll_directory_cookie
+    if _DLL_PATH_SET:
+        return
+    
+    dll_dir = _get_dll_dir(platform.system(), platform.machine())
+    if dll_dir is None:
+        _DLL_PATH_SET = True
+        return
+    
+    if os.path.exists(dll_dir):
+        # For Python 3.8+, os.add_dll_directory is the supported mechanism
+        registered = False
+        if hasattr(os, 'add_dll_directory'):
+            try:
+                _dll_directory_cookie = os.add_dll_directory(dll_dir)
+                registered = True
+            except (OSError, AttributeError):
+                pass  # Fallback to PATH method
+        
+        if not registered and dll_dir not in _PATH_DIRS_ADDED:
             # Add DLL directory to PATH
-            current_path = os.environ.get('PATH', '')
-            if dll_dir not in current_path:
-                os.environ['PATH'] = dll_dir + os.pathsep + current_path
-            
-            # For Python 3.8+, also use os.add_dll_directory
-            if hasattr(os, 'add_dll_directory'):
-                try:
-                    os.add_dll_directory(dll_dir)
-                except (OSError, AttributeError):
-                    pass  # Fallback to PATH method
-            
-            print(f"Added DLL directory to search path: {dll_dir}")
-        else:
-            print(f"Warning: DLL directory not found: {dll_dir}")
+            os.environ['PATH'] = os.pathsep.join((dll_dir, os.environ.get('PATH', '')))
+            _PATH_DIRS_ADDED.add(dll_dir)
+        
+        _DLL_PATH_SET = True
+        print(f"Added DLL directory to search path: {dll_dir}")
+    else:
+        print(f"Warning: DLL directory not found: {dll_dir}")
 
 # Setup DLL path before importing the extension
 _setup_dll_path()
@@ -55,6 +133,42 @@ except ImportError:
     print("python setup_crossplatform.py build_ext --inplace")
 
 
+class FrameView:
+    """Raw temperature frame whose Celsius conversion and analysis are computed once"""
+    
+    __slots__ = ('raw', '_celsius', '_analysis')
+    
+    def __init__(self, raw: np.ndarray):
+        self.raw = raw
+        self._celsius = None
+        self._analysis = None  # (include_median, result) from TinyThermalCamera.analyze_frame
+    
+    @classmethod
+    def from_ndarray(cls, frame: Union[np.ndarray, 'FrameView']) -> 'FrameView':
+        """Wrap a raw frame, passing existing views through unchanged"""
+        return frame if isinstance(frame, cls) else cls(frame)
+    
+    @property
+    def celsius(self) -> np.ndarray:
+        """Temperature data in Celsius (float32), converted on first access"""
+        if self._celsius is None:
+            self._celsius = _convert_to_celsius(self.raw)
+        return self._celsius
+    
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.raw.shape
+
+
+# Anything the analysis methods accept: a raw uint16 frame or a FrameView over one
+FrameLike = Union[np.ndarray, FrameView]
+
+
+def _raw_frame(frame: FrameLike) -> np.ndarray:
+    """Return the raw uint16 array behind a frame or frame view"""
+    return frame.raw if isinstance(frame, FrameView) else frame
+
+
 class TinyThermalCamera:
     """Simplified thermal camera interface"""
     
@@ -65,6 +179,9 @@ class TinyThermalCamera:
         self._camera = tiny_thermal_camera.ThermalCamera()
         self._temp_processor = tiny_thermal_camera.TemperatureProcessor()
         self._is_initialized = False
+        # Per-frame scratch buffers, reused across frames to avoid allocator churn
+        self._celsius_buf = None
+        self._raw_buf = None
     
     def __enter__(self):
         """Context manager entry"""
@@ -88,6 +205,11 @@ class TinyThermalCamera:
         
         if self._camera.open():
             self._is_initialized = True
+            # The reported height covers the image and temperature frames
+            # together; temperature frames are half of it
+            width, height, _ = self._camera.get_camera_info()
+            self._celsius_buf = np.empty((height // 2, width), dtype=np.float32)
+            self._raw_buf = np.empty((height // 2, width), dtype=np.uint16)
             return True
         return False
     
@@ -156,39 +278,102 @@ class TinyThermalCamera:
         
         return temp_frame, image_frame
     
-    def get_temperature_celsius(self, temp_frame: np.ndarray) -> np.ndarray:
+    def capture_frame_view(self) -> Tuple[Optional[FrameView], Optional[np.ndarray]]:
+        """
+        Capture a single frame, wrapping the temperature data in a FrameView
+        
+        Returns:
+            Tuple containing:
+                - FrameView over the raw temperature frame or None if failed
+                - Image frame as numpy array (uint8) or None if not available
+        """
+        temp_frame, image_frame = self.capture_frame()
+        view = FrameView(temp_frame) if temp_frame is not None else None
+        return view, image_frame
+    
+    def _as_view(self, frame: FrameLike) -> FrameView:
+        """Return frame's FrameView, or a fresh one for a plain array
+
+        Plain arrays are never cached: the caller may change them in place
+        between calls, so only explicit views keep their results.
+        """
+        return FrameView.from_ndarray(frame)
+    
+    def _frame_buffer(self, name: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        """Return the scratch buffer stored in attribute `name`, reallocating on shape/dtype change"""
+        buf = getattr(self, name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            setattr(self, name, buf)
+        return buf
+    
+    def get_temperature_celsius(self, temp_frame: FrameLike,
+                                out: Optional[np.ndarray] = None,
+                                reuse_buffer: bool = False) -> np.ndarray:
         """
         Convert raw temperature frame to Celsius
         
+        Without `out` or `reuse_buffer`, a FrameView caches its conversion, so
+        repeated calls for the same view return the same array; a plain array
+        is converted into a new array on every call.
+        
         Args:
-            temp_frame: Raw temperature frame from capture_frame()
+            temp_frame: Raw temperature frame or FrameView from capture_frame_view()
+            out: Optional preallocated float32 array to write the result into
+            reuse_buffer: If True and no `out` is given, write into the camera's
+                internal buffer. The result is overwritten by the next call, so
+                copy it if it must outlive the current frame.
         
         Returns:
-            np.ndarray: Temperature data in Celsius
+            np.ndarray: Temperature data in Celsius (float32)
         """
-        return np.vectorize(tiny_thermal_camera.temp_to_celsius)(temp_frame)
+        if out is None and not reuse_buffer:
+            return self._as_view(temp_frame).celsius
+        
+        raw = _raw_frame(temp_frame)
+        if out is None:
+            out = self._frame_buffer('_celsius_buf', raw.shape, np.float32)
+        return _convert_to_celsius(raw, out)
     
-    def get_point_temperature(self, temp_frame: np.ndarray, x: int, y: int) -> Optional[float]:
+    def get_point_temperature(self, temp_frame: FrameLike, x: int, y: int) -> Optional[float]:
         """
         Get temperature at specific point
         
         Args:
-            temp_frame: Raw temperature frame
+            temp_frame: Raw temperature frame or FrameView
+            x, y: Pixel coordinates
+        
+        Returns:
+            float: Temperature in Celsius, or None if failed
+        """
+        return self.point_temperature(temp_frame, x, y)
+    
+    @staticmethod
+    def point_temperature(temp_frame: FrameLike, x: int, y: int) -> Optional[float]:
+        """
+        Get temperature at specific point without an open camera
+        
+        Args:
+            temp_frame: Raw temperature frame or FrameView
             x, y: Pixel coordinates
         
         Returns:
             float: Temperature in Celsius, or None if failed
         """
-        success, temp = self._temp_processor.get_point_temp(temp_frame, x, y)
+        if tiny_thermal_camera is None:
+            raise RuntimeError("tiny_thermal_camera module not available")
+        
+        success, temp = tiny_thermal_camera.TemperatureProcessor.get_point_temp(
+            _raw_frame(temp_frame), x, y)
         return temp if success else None
     
-    def get_area_temperature(self, temp_frame: np.ndarray, x: int, y: int, 
+    def get_area_temperature(self, temp_frame: FrameLike, x: int, y: int, 
                            width: int, height: int) -> Optional[Tuple[float, float, float]]:
         """
         Get temperature statistics for rectangular area
         
         Args:
-            temp_frame: Raw temperature frame
+            temp_frame: Raw temperature frame or FrameView
             x, y: Top-left corner coordinates
             width, height: Rectangle dimensions
         
@@ -196,16 +381,16 @@ class TinyThermalCamera:
             Tuple[float, float, float]: (max_temp, min_temp, avg_temp) or None if failed
         """
         success, max_temp, min_temp, avg_temp = self._temp_processor.get_rect_temp(
-            temp_frame, x, y, width, height)
+            _raw_frame(temp_frame), x, y, width, height)
         return (max_temp, min_temp, avg_temp) if success else None
     
-    def get_line_temperature(self, temp_frame: np.ndarray, x1: int, y1: int, 
+    def get_line_temperature(self, temp_frame: FrameLike, x1: int, y1: int, 
                            x2: int, y2: int) -> Optional[Tuple[float, float, float]]:
         """
         Get temperature statistics along a line
         
         Args:
-            temp_frame: Raw temperature frame
+            temp_frame: Raw temperature frame or FrameView
             x1, y1: Start point coordinates
             x2, y2: End point coordinates
         
@@ -213,67 +398,114 @@ class TinyThermalCamera:
             Tuple[float, float, float]: (max_temp, min_temp, avg_temp) or None if failed
         """
         success, max_temp, min_temp, avg_temp = self._temp_processor.get_line_temp(
-            temp_frame, x1, y1, x2, y2)
+            _raw_frame(temp_frame), x1, y1, x2, y2)
         return (max_temp, min_temp, avg_temp) if success else None
     
-    def find_hotspot(self, temp_frame: np.ndarray) -> Tuple[Tuple[int, int], float]:
+    def analyze_frame(self, temp_frame: FrameLike, include_median: bool = False) -> dict:
+        """
+        Compute hotspot, coldspot and temperature statistics in a single pass
+        
+        Extrema and moments are computed on the raw uint16 data; only the
+        resulting scalars are converted to Celsius. For a FrameView the result
+        is cached on the view, so calling find_hotspot(), find_coldspot() and
+        get_temperature_stats() on the same view scans it once.
+        
+        Args:
+            temp_frame: Raw temperature frame or FrameView
+            include_median: If True, also compute the median (O(n) selection on a scratch copy)
+        
+        Returns:
+            dict: 'hotspot' and 'coldspot' as ((x, y), temp) plus min, max, mean,
+                  std, range (and median if requested), all in Celsius
+        """
+        view = self._as_view(temp_frame)
+        cached = view._analysis
+        if cached is not None and (cached[0] or not include_median):
+            return cached[1]
+        
+        temp_frame = view.raw
+        raw = temp_frame.ravel()
+        n = raw.size
+        min_idx, max_idx, total, total_sq = (int(v) for v in _scan_raw_frame(raw))
+        
+        # Exact integer variance of the raw counts, then scale to Celsius
+        raw_var = (n * total_sq - total * total) / (n * n)
+        min_temp = _raw_to_celsius(int(raw[min_idx]))
+        max_temp = _raw_to_celsius(int(raw[max_idx]))
+        min_y, min_x = np.unravel_index(min_idx, temp_frame.shape)  # numpy uses (row, col) indexing
+        max_y, max_x = np.unravel_index(max_idx, temp_frame.shape)
+        
+        result = {
+            'hotspot': ((int(max_x), int(max_y)), max_temp),
+            'coldspot': ((int(min_x), int(min_y)), min_temp),
+            'min': min_temp,
+            'max': max_temp,
+            'mean': _raw_to_celsius(total / n),
+            'std': math.sqrt(max(raw_var, 0.0)) / TEMP_SCALE,
+            'range': max_temp - min_temp,
+        }
+        if include_median:
+            # Select in a reused scratch copy so the caller's frame is left untouched
+            scratch = self._frame_buffer('_raw_buf', temp_frame.shape, temp_frame.dtype)
+            np.copyto(scratch, temp_frame)
+            flat = scratch.reshape(-1)
+            mid = n // 2
+            if n % 2:
+                flat.partition(mid)
+                median_raw = float(flat[mid])
+            else:
+                flat.partition((mid - 1, mid))
+                median_raw = (float(flat[mid - 1]) + float(flat[mid])) / 2
+            result['median'] = _raw_to_celsius(median_raw)
+        
+        view._analysis = (include_median, result)
+        return result
+    
+    def find_hotspot(self, temp_frame: FrameLike) -> Tuple[Tuple[int, int], float]:
         """
         Find the hottest point in the temperature frame
         
         Args:
-            temp_frame: Raw temperature frame
+            temp_frame: Raw temperature frame or FrameView
         
         Returns:
             Tuple containing:
                 - (x, y) coordinates of hottest point
                 - Temperature in Celsius
         """
-        temp_celsius = self.get_temperature_celsius(temp_frame)
-        max_idx = np.unravel_index(np.argmax(temp_celsius), temp_celsius.shape)
-        y, x = max_idx  # numpy uses (row, col) indexing
-        max_temp = temp_celsius[max_idx]
-        
-        return (x, y), max_temp
+        return self.analyze_frame(temp_frame)['hotspot']
     
-    def find_coldspot(self, temp_frame: np.ndarray) -> Tuple[Tuple[int, int], float]:
+    def find_coldspot(self, temp_frame: FrameLike) -> Tuple[Tuple[int, int], float]:
         """
         Find the coldest point in the temperature frame
         
         Args:
-            temp_frame: Raw temperature frame
+            temp_frame: Raw temperature frame or FrameView
         
         Returns:
             Tuple containing:
                 - (x, y) coordinates of coldest point
                 - Temperature in Celsius
         """
-        temp_celsius = self.get_temperature_celsius(temp_frame)
-        min_idx = np.unravel_index(np.argmin(temp_celsius), temp_celsius.shape)
-        y, x = min_idx  # numpy uses (row, col) indexing
-        min_temp = temp_celsius[min_idx]
-        
-        return (x, y), min_temp
+        return self.analyze_frame(temp_frame)['coldspot']
     
-    def get_temperature_stats(self, temp_frame: np.ndarray) -> dict:
+    def get_temperature_stats(self, temp_frame: FrameLike, include_median: bool = False) -> dict:
         """
         Get comprehensive temperature statistics
         
         Args:
-            temp_frame: Raw temperature frame
+            temp_frame: Raw temperature frame or FrameView
+            include_median: If True, also include the median
         
         Returns:
             dict: Temperature statistics including min, max, mean, std, etc.
         """
-        temp_celsius = self.get_temperature_celsius(temp_frame)
-        
-        return {
-            'min': float(np.min(temp_celsius)),
-            'max': float(np.max(temp_celsius)),
-            'mean': float(np.mean(temp_celsius)),
-            'median': float(np.median(temp_celsius)),
-            'std': float(np.std(temp_celsius)),
-            'range': float(np.max(temp_celsius) - np.min(temp_celsius)),
-        }
+        analysis = self.analyze_frame(temp_frame, include_median=include_median)
+        stats = {key: analysis[key] for key in ('min', 'max', 'mean', 'std', 'range')}
+        if include_median:
+            stats['median'] = analysis['median']
+        
+        return stats
     
     @property
     def is_open(self) -> bool:
@@ -317,8 +549,7 @@ def quick_temperature_at_point(x: int, y: int) -> Optional[float]:
     temp_frame, _ = quick_capture()
     if temp_frame is not None:
         try:
-            with TinyThermalCamera() as camera:
-                return camera.get_point_temperature(temp_frame, x, y)
+            return TinyThermalCamera.point_temperature(temp_frame, x, y)
         except Exception:
             pass
     return None
@@ -338,8 +569,8 @@ if __name__ == "__main__":
             if camera.start_streaming():
                 print("Streaming started")
                 
-                # Capture a frame
-                temp_frame, image_frame = camera.capture_frame()
+                # Capture a frame; the view lets the calls below share one scan
+                temp_frame, image_frame = camera.capture_frame_view()
                 
                 if temp_frame is not None:
                     print(f"Temperature frame shape: {temp_frame.shape}")
@@ -1,6 +1,8 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/numpy.h>
 #include <pybind11/stl.h>
+#include <string>
+#include <vector>
 #include "include/all_config.h"
 #include "include/libiruvc.h"
 #include "include/libirtemp.h"
@@ -172,6 +174,20 @@ public:
     bool is_camera_streaming() const { return is_streaming; }
 };
 
+// One measurement requested through TemperatureProcessor.analyze_batch
+struct BatchOp {
+    enum Kind { POINT, RECT, LINE } kind;
+    int args[4];
+};
+
+// Raw result of a BatchOp; a point's value is kept in max_temp
+struct BatchResult {
+    bool ok;
+    uint16_t max_temp;
+    uint16_t min_temp;
+    uint16_t avr_temp;
+};
+
 class TemperatureProcessor {
 public:
     static float temp_value_to_celsius(uint16_t temp_val) {
@@ -244,6 +260,94 @@ public:
         
         return py::make_tuple(false, 0.0f, 0.0f, 0.0f);
     }
+
+    static py::list analyze_batch(py::array_t<uint16_t, py::array::c_style | py::array::forcecast> temp_data,
+                                  py::iterable ops) {
+        if (temp_data.ndim() != 2) {
+            throw py::value_error("Temperature frame must be 2-D");
+        }
+        
+        // Parse ('point', x, y), ('rect', x, y, w, h) and ('line', x1, y1, x2, y2)
+        std::vector<BatchOp> batch;
+        for (auto item : ops) {
+            py::sequence op = item.cast<py::sequence>();
+            std::string kind = op.size() > 0 ? op[0].cast<std::string>() : "";
+            
+            BatchOp parsed = {BatchOp::POINT, {0, 0, 0, 0}};
+            size_t nargs = 4;
+            if (kind == "point") {
+                nargs = 2;
+            } else if (kind == "rect") {
+                parsed.kind = BatchOp::RECT;
+            } else if (kind == "line") {
+                parsed.kind = BatchOp::LINE;
+            } else {
+                throw py::value_error("Unknown measurement '" + kind + "' (expected point, rect or line)");
+            }
+            if (op.size() != nargs + 1) {
+                throw py::value_error("Wrong number of arguments for '" + kind + "' measurement");
+            }
+            for (size_t i = 0; i < nargs; ++i) {
+                parsed.args[i] = op[i + 1].cast<int>();
+            }
+            batch.push_back(parsed);
+        }
+        
+        auto buf = temp_data.request();
+        uint16_t* ptr = (uint16_t*)buf.ptr;
+        
+        TempDataRes_t temp_res = {(uint16_t)buf.shape[1], (uint16_t)buf.shape[0]};
+        std::vector<BatchResult> results(batch.size());
+        
+        {
+            // Only plain C data is touched from here on, so let other Python threads run
+            py::gil_scoped_release release;
+            
+            for (size_t i = 0; i < batch.size(); ++i) {
+                const int* a = batch[i].args;
+                BatchResult& res = results[i];
+                TempInfo_t temp_info = {0};
+                
+                if (batch[i].kind == BatchOp::POINT) {
+                    Dot_t point = {(uint16_t)a[0], (uint16_t)a[1]};
+                    res.ok = get_point_temp(ptr, temp_res, point, &res.max_temp) == IRTEMP_SUCCESS;
+                    continue;
+                }
+                
+                if (batch[i].kind == BatchOp::RECT) {
+                    Area_t rect = {(uint16_t)a[0], (uint16_t)a[1], (uint16_t)a[2], (uint16_t)a[3]};
+                    res.ok = get_rect_temp(ptr, temp_res, rect, &temp_info) == IRTEMP_SUCCESS;
+                } else {
+                    Line_t line = {(uint16_t)a[0], (uint16_t)a[1], (uint16_t)a[2], (uint16_t)a[3]};
+                    res.ok = get_line_temp(ptr, temp_res, line, &temp_info) == IRTEMP_SUCCESS;
+                }
+                res.max_temp = temp_info.max_temp;
+                res.min_temp = temp_info.min_temp;
+                res.avr_temp = temp_info.avr_temp;
+            }
+        }
+        
+        // Same tuples as get_point_temp / get_rect_temp / get_line_temp
+        py::list out;
+        for (size_t i = 0; i < batch.size(); ++i) {
+            const BatchResult& res = results[i];
+            if (batch[i].kind == BatchOp::POINT) {
+                out.append(res.ok ? py::make_tuple(true, temp_value_converter(res.max_temp))
+                                  : py::make_tuple(false, 0.0f));
+            } else if (res.ok) {
+                out.append(py::make_tuple(
+                    true,
+                    temp_value_converter(res.max_temp),
+                    temp_value_converter(res.min_temp),
+                    temp_value_converter(res.avr_temp)
+                ));
+            } else {
+                out.append(py::make_tuple(false, 0.0f, 0.0f, 0.0f));
+            }
+        }
+        
+        return out;
+    }
 };
 
 PYBIND11_MODULE(thermal_camera, m) {
@@ -269,7 +373,9 @@ PYBIND11_MODULE(thermal_camera, m) {
         .def_static("get_rect_temp", &TemperatureProcessor::get_rect_temperature,
                    "Get temperature statistics for rectangle area")
         .def_static("get_line_temp", &TemperatureProcessor::get_line_temperature,
-                   "Get temperature statistics along a line");
+                   "Get temperature statistics along a line")
+        .def_static("analyze_batch", &TemperatureProcessor::analyze_batch,
+                   "Run several point/rect/line measurements on one frame in a single call");
     
     // Utility functions
     m.def("temp_to_celsius", &temp_value_converter, "Convert raw temperature value to Celsius");
@@ -1,6 +1,9 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/numpy.h>
 #include <pybind11/stl.h>
+#include <cstdlib>
+#include <string>
+#include <vector>
 
 // When using pre-built libraries on Windows, we need to import symbols
 #ifdef _WIN32
@@ -66,7 +69,12 @@ public:
         }
 
         DevCfg_t devs_cfg[64] = {0};
-        int result = uvc_camera_list(devs_cfg);
+        int result;
+        {
+            // USB enumeration can take a while; let other Python threads run
+            py::gil_scoped_release release;
+            result = uvc_camera_list(devs_cfg);
+        }
         
         if (result < 0) {
             return py::make_tuple(false, py::list());
@@ -426,7 +434,115 @@ public:
     }
 };
 
+// One measurement requested through TemperatureProcessor.analyze_batch
+struct BatchOp {
+    enum Kind { POINT, RECT, LINE } kind;
+    int args[4];
+};
+
+// Raw result of a measurement; a point's value is kept in max_temp
+struct BatchResult {
+    bool ok;
+    uint16_t max_temp;
+    uint16_t min_temp;
+    uint16_t avr_temp;
+};
+
 class TemperatureProcessor {
+private:
+    // Raw measurements shared by the single and batched calls. They only touch
+    // plain C data, so analyze_batch can run them without the GIL.
+    static BatchResult measure_point(const uint16_t* ptr, int img_width, int img_height, int x, int y) {
+        BatchResult res = {false, 0, 0, 0};
+        if (x < 0 || x >= img_width || y < 0 || y >= img_height) {
+            return res;
+        }
+        res.ok = true;
+        res.max_temp = ptr[y * img_width + x];
+        return res;
+    }
+
+    static BatchResult measure_rect(const uint16_t* ptr, int img_width, int img_height,
+                                    int x, int y, int width, int height) {
+        BatchResult res = {false, 0, 0, 0};
+        
+        // Bounds checking
+        if (x < 0 || y < 0 || x + width > img_width || y + height > img_height) {
+            return res;
+        }
+        
+        uint16_t min_temp = 65535, max_temp = 0;
+        uint32_t sum_temp = 0;
+        int count = 0;
+        
+        for (int row = y; row < y + height; row++) {
+            for (int col = x; col < x + width; col++) {
+                uint16_t temp = ptr[row * img_width + col];
+                if (temp < min_temp) min_temp = temp;
+                if (temp > max_temp) max_temp = temp;
+                sum_temp += temp;
+                count++;
+            }
+        }
+        
+        if (count == 0) {
+            return res;
+        }
+        
+        res.ok = true;
+        res.max_temp = max_temp;
+        res.min_temp = min_temp;
+        res.avr_temp = (uint16_t)(sum_temp / count);
+        return res;
+    }
+
+    static BatchResult measure_line(const uint16_t* ptr, int img_width, int img_height,
+                                    int x1, int y1, int x2, int y2) {
+        BatchResult res = {false, 0, 0, 0};
+        
+        // Both end points must lie inside the frame
+        if (x1 < 0 || x1 >= img_width || y1 < 0 || y1 >= img_height ||
+            x2 < 0 || x2 >= img_width || y2 < 0 || y2 >= img_height) {
+            return res;
+        }
+        
+        uint16_t min_temp = 65535, max_temp = 0;
+        uint32_t sum_temp = 0;
+        int count = 0;
+        
+        // Bresenham walk over every pixel on the line, end points included
+        int dx = std::abs(x2 - x1), sx = x1 < x2 ? 1 : -1;
+        int dy = -std::abs(y2 - y1), sy = y1 < y2 ? 1 : -1;
+        int err = dx + dy;
+        int x = x1, y = y1;
+        while (true) {
+            uint16_t temp = ptr[y * img_width + x];
+            if (temp < min_temp) min_temp = temp;
+            if (temp > max_temp) max_temp = temp;
+            sum_temp += temp;
+            count++;
+            
+            if (x == x2 && y == y2) break;
+            int e2 = 2 * err;
+            if (e2 >= dy) { err += dy; x += sx; }
+            if (e2 <= dx) { err += dx; y += sy; }
+        }
+        
+        res.ok = true;
+        res.max_temp = max_temp;
+        res.min_temp = min_temp;
+        res.avr_temp = (uint16_t)(sum_temp / count);
+        return res;
+    }
+
+    static py::tuple stats_tuple(const BatchResult& res) {
+        if (!res.ok) {
+            return py::make_tuple(false, 0.0f, 0.0f, 0.0f);
+        }
+        return py::make_tuple(true, temp_to_celsius(res.max_temp),
+                              temp_to_celsius(res.min_temp), temp_to_celsius(res.avr_temp));
+    }
+
 public:
     static float temp_to_celsius(uint16_t temp_val) {
         return ((double)temp_val / 64.0 - 273.15);
@@ -438,16 +554,11 @@ public:
         }
         
         auto buf = temp_data.request();
-        uint16_t* ptr = (uint16_t*)buf.ptr;
-        
-        if (x < 0 || x >= buf.shape[1] || y < 0 || y >= buf.shape[0]) {
+        BatchResult res = measure_point((const uint16_t*)buf.ptr, buf.shape[1], buf.shape[0], x, y);
+        if (!res.ok) {
             return py::make_tuple(false, 0.0f);
         }
-        
-        uint16_t temp_raw = ptr[y * buf.shape[1] + x];
-        float temp_celsius = temp_to_celsius(temp_raw);
-        
-        return py::make_tuple(true, temp_celsius);
+        return py::make_tuple(true, temp_to_celsius(res.max_temp));
     }
 
     static py::tuple get_rect_temperature(py::array_t<uint16_t> temp_data, int x, int y, int width, int height) {
@@ -456,39 +567,87 @@ public:
         }
         
         auto buf = temp_data.request();
-        uint16_t* ptr = (uint16_t*)buf.ptr;
-        
-        int img_width = buf.shape[1];
-        int img_height = buf.shape[0];
-        
-        // Bounds checking
-        if (x < 0 || y < 0 || x + width > img_width || y + height > img_height) {
+        return stats_tuple(measure_rect((const uint16_t*)buf.ptr, buf.shape[1], buf.shape[0],
+                                        x, y, width, height));
+    }
+
+    static py::tuple get_line_temperature(py::array_t<uint16_t> temp_data, int x1, int y1, int x2, int y2) {
+        if (temp_data.ndim() != 2) {
             return py::make_tuple(false, 0.0f, 0.0f, 0.0f);
         }
         
-        uint16_t min_temp = 65535, max_temp = 0;
-        uint32_t sum_temp = 0;
-        int count = 0;
+        auto buf = temp_data.request();
+        return stats_tuple(measure_line((const uint16_t*)buf.ptr, buf.shape[1], buf.shape[0],
+                                        x1, y1, x2, y2));
+    }
+
+    static py::list analyze_batch(py::array_t<uint16_t, py::array::c_style | py::array::forcecast> temp_data,
+                                  py::iterable ops) {
+        if (temp_data.ndim() != 2) {
+            throw py::value_error("Temperature frame must be 2-D");
+        }
         
-        for (int row = y; row < y + height; row++) {
-            for (int col = x; col < x + width; col++) {
-                uint16_t temp = ptr[row * img_width + col];
-                if (temp < min_temp) min_temp = temp;
-                if (temp > max_temp) max_temp = temp;
-                sum_temp += temp;
-                count++;
+        // Parse ('point', x, y), ('rect', x, y, w, h) and ('line', x1, y1, x2, y2)
+        std::vector<BatchOp> batch;
+        for (auto item : ops) {
+            py::sequence op = item.cast<py::sequence>();
+            std::string kind = op.size() > 0 ? op[0].cast<std::string>() : "";
+            
+            BatchOp parsed = {BatchOp::POINT, {0, 0, 0, 0}};
+            size_t nargs = 4;
+            if (kind == "point") {
+                nargs = 2;
+            } else if (kind == "rect") {
+                parsed.kind = BatchOp::RECT;
+            } else if (kind == "line") {
+                parsed.kind = BatchOp::LINE;
+            } else {
+                throw py::value_error("Unknown measurement '" + kind + "' (expected point, rect or line)");
             }
+            if (op.size() != nargs + 1) {
+                throw py::value_error("Wrong number of arguments for '" + kind + "' measurement");
+            }
+            for (size_t i = 0; i < nargs; ++i) {
+                parsed.args[i] = op[i + 1].cast<int>();
+            }
+            batch.push_back(parsed);
         }
         
-        if (count == 0) {
-            return py::make_tuple(false, 0.0f, 0.0f, 0.0f);
+        auto buf = temp_data.request();
+        const uint16_t* ptr = (const uint16_t*)buf.ptr;
+        int img_width = buf.shape[1];
+        int img_height = buf.shape[0];
+        std::vector<BatchResult> results(batch.size());
+        
+        {
+            // Only plain C data is touched from here on, so let other Python threads run
+            py::gil_scoped_release release;
+            
+            for (size_t i = 0; i < batch.size(); ++i) {
+                const int* a = batch[i].args;
+                if (batch[i].kind == BatchOp::POINT) {
+                    results[i] = measure_point(ptr, img_width, img_height, a[0], a[1]);
+                } else if (batch[i].kind == BatchOp::RECT) {
+                    results[i] = measure_rect(ptr, img_width, img_height, a[0], a[1], a[2], a[3]);
+                } else {
+                    results[i] = measure_line(ptr, img_width, img_height, a[0], a[1], a[2], a[3]);
+                }
+            }
         }
         
-        float max_celsius = temp_to_celsius(max_temp);
-        float min_celsius = temp_to_celsius(min_temp);
-        float avg_celsius = temp_to_celsius(sum_temp / count);
+        // Same tuples as get_point_temp / get_rect_temp / get_line_temp
+        py::list out;
+        for (size_t i = 0; i < batch.size(); ++i) {
+            const BatchResult& res = results[i];
+            if (batch[i].kind == BatchOp::POINT) {
+                out.append(res.ok ? py::make_tuple(true, temp_to_celsius(res.max_temp))
+                                  : py::make_tuple(false, 0.0f));
+            } else {
+                out.append(stats_tuple(res));
+            }
+        }
         
-        return py::make_tuple(true, max_celsius, min_celsius, avg_celsius);
+        return out;
     }
 };
 
@@ -497,10 +656,12 @@ PYBIND11_MODULE(tiny_thermal_camera, m) {
     
     py::class_<TinyThermalCamera>(m, "ThermalCamera")
         .def(py::init<>())
-        .def("initialize", &TinyThermalCamera::initialize, "Initialize the camera system")
+        .def("initialize", &TinyThermalCamera::initialize, "Initialize the camera system",
+             py::call_guard<py::gil_scoped_release>())
         .def("get_device_list", &TinyThermalCamera::get_device_list, "Get list of available thermal cameras")
         .def("open", &TinyThermalCamera::open_camera, "Open thermal camera", 
-             py::arg("vid") = 0x0BDA, py::arg("pid") = 0x5840)
+             py::arg("vid") = 0x0BDA, py::arg("pid") = 0x5840,
+             py::call_guard<py::gil_scoped_release>())
         .def("close", &TinyThermalCamera::close_camera, "Close thermal camera")
         .def("start_stream", &TinyThermalCamera::start_streaming, "Start camera streaming",
              py::arg("enable_temperature_mode") = true,
@@ -525,7 +686,12 @@ PYBIND11_MODULE(tiny_thermal_camera, m) {
         .def_static("get_point_temp", &TemperatureProcessor::get_point_temperature,
                    "Get temperature at specific point (x, y)")
         .def_static("get_rect_temp", &TemperatureProcessor::get_rect_temperature,
-                   "Get temperature statistics for rectangle area");
+                   "Get temperature statistics for rectangle area")
+        .def_static("get_line_temp", &TemperatureProcessor::get_line_temperature,
+                   "Get temperature statistics along a line from (x1, y1) to (x2, y2)")
+        .def_static("analyze_batch", &TemperatureProcessor::analyze_batch,
+                   "Run several point/rect/line measurements on one frame in a single call",
+                   py::arg("temp_data"), py::arg("ops"));
     
     // Utility functions
     m.def("temp_to_celsius", &TemperatureProcessor::temp_to_celsius, "Convert raw temperature value to Celsius");
@@ -4,10 +4,17 @@ Generate import libraries (.lib) from DLLs for Windows x64
 This is needed to link against the DLLs when building the Python extension
 """
 
+import functools
+import json
 import os
+import re
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# One export row of `dumpbin /exports`: ordinal, hint, RVA, name
+_EXPORT_RE = re.compile(r'^\s*\d+\s+[0-9A-F]+\s+[0-9A-F]+\s+(\S+)')
 
 def copy_dlls():
     """Copy 64-bit DLLs from FalconApplication"""
@@ -37,39 +44,181 @@ def copy_dlls():
     print(f"\nDLLs copied to {target_dir}")
     return target_dir
 
+def _process_one(dll_file, dll_dir, dumpbin_path, lib_exe, gendef=None, dlltool=None):
+    """Run the dumpbin -> .def -> lib.exe pipeline for one DLL.
+    
+    When gendef is given it writes the .def file straight from the DLL, and
+    when llvm-dlltool is given it replaces lib.exe.
+    
+    Returns (dll_file, ok, messages); output is collected rather than printed
+    so parallel runs don't interleave.
+    """
+    dll_path = os.path.join(dll_dir, dll_file)
+    lib_file = dll_file.replace('.dll', '.lib')
+    lib_path = os.path.join(dll_dir, lib_file)
+    def_file = dll_file.replace('.dll', '.def')
+    def_path = os.path.join(dll_dir, def_file)
+    messages = []
+    
+    # Step 1: Export symbols
+    try:
+        if gendef:
+            # gendef writes the .def itself, so the export text never passes through Python
+            with open(def_path, 'w') as f:
+                subprocess.run([gendef, "-", dll_path], stdout=f,
+                               stderr=subprocess.DEVNULL, check=True)
+            messages.append(f"  Created {def_file} with gendef")
+            return _build_import_lib(dll_file, def_path, lib_path, lib_exe, dlltool, messages)
+        
+        # Parse exports line by line as dumpbin produces them, skipping mangled C++ names
+        cmd = [dumpbin_path, "/exports", dll_path]
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              bufsize=1 << 20, text=True) as proc:
+            symbols = [m.group(1) for line in proc.stdout
+                       for m in (_EXPORT_RE.match(line),)
+                       if m and not m.group(1).startswith('?')]
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+        
+        if not symbols:
+            messages.append(f"  Warning: No exports found in {dll_file}")
+            return dll_file, False, messages
+        
+        # Create DEF file
+        with open(def_path, 'w') as f:
+            f.write(f"LIBRARY {dll_file}\n")
+            f.write("EXPORTS\n")
+            for symbol in symbols:
+                f.write(f"    {symbol}\n")
+        
+        messages.append(f"  Created {def_file} with {len(symbols)} exports")
+        return _build_import_lib(dll_file, def_path, lib_path, lib_exe, dlltool, messages)
+            
+    except subprocess.CalledProcessError as e:
+        messages.append(f"  Error processing {dll_file}: {e}")
+    except Exception as e:
+        messages.append(f"  Unexpected error: {e}")
+    return dll_file, False, messages
+
+def _build_import_lib(dll_file, def_path, lib_path, lib_exe, dlltool, messages):
+    """Step 2 of _process_one: turn the .def file into an import library"""
+    if dlltool:
+        cmd = [dlltool, "-m", "i386:x86-64", "-D", dll_file, "-d", def_path, "-l", lib_path]
+    else:
+        cmd = [lib_exe, f"/def:{def_path}", f"/out:{lib_path}", "/machine:x64"]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    
+    if result.returncode == 0:
+        messages.append(f"  Generated {os.path.basename(lib_path)}")
+        # Clean up DEF file
+        os.remove(def_path)
+        return dll_file, True, messages
+    
+    messages.append(f"  Error generating lib: {result.stderr}")
+    return dll_file, False, messages
+
+# Fallback Visual Studio locations when vswhere is not available
+VS_PATHS = [
+    r"C:\Program Files (x86)\Microsoft Visual Studio\2019\BuildTools\VC\Tools\MSVC",
+    r"C:\Program Files (x86)\Microsoft Visual Studio\2019\Community\VC\Tools\MSVC",
+    r"C:\Program Files (x86)\Microsoft Visual Studio\2019\Professional\VC\Tools\MSVC",
+    r"C:\Program Files (x86)\Microsoft Visual Studio\2019\Enterprise\VC\Tools\MSVC",
+    r"C:\Program Files\Microsoft Visual Studio\2022\BuildTools\VC\Tools\MSVC",
+    r"C:\Program Files\Microsoft Visual Studio\2022\Community\VC\Tools\MSVC",
+]
+
+def _vs_tools_cache_file():
+    """Location of the cached dumpbin/lib.exe paths"""
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'tiny_thermal_camera', 'vs_tools.json')
+
+def _tools_in(msvc_dir):
+    """Return (dumpbin, lib) from the newest toolset under a VC\\Tools\\MSVC directory"""
+    try:
+        with os.scandir(msvc_dir) as entries:
+            versions = [e.name for e in entries if e.is_dir()]
+    except OSError:
+        return None
+    if not versions:
+        return None
+    
+    tool_dir = os.path.join(msvc_dir, max(versions), "bin", "Hostx64", "x64")
+    dumpbin_path = os.path.join(tool_dir, "dumpbin.exe")
+    lib_path = os.path.join(tool_dir, "lib.exe")
+    if os.path.exists(dumpbin_path) and os.path.exists(lib_path):
+        return dumpbin_path, lib_path
+    return None
+
+def _vswhere_msvc_dir():
+    """Ask vswhere for the newest install with the x64 C++ tools"""
+    program_files = os.environ.get('ProgramFiles(x86)', r"C:\Program Files (x86)")
+    vswhere = os.path.join(program_files, "Microsoft Visual Studio", "Installer", "vswhere.exe")
+    if not os.path.exists(vswhere):
+        return None
+    
+    try:
+        install_path = subprocess.check_output(
+            [vswhere, "-latest", "-products", "*",
+             "-requires", "Microsoft.VisualStudio.Component.VC.Tools.x86.x64",
+             "-property", "installationPath"],
+            stderr=subprocess.DEVNULL, text=True, timeout=30).strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if not install_path:
+        return None
+    return os.path.join(install_path, "VC", "Tools", "MSVC")
+
+@functools.lru_cache(maxsize=None)
+def _find_vs_tools():
+    """Locate dumpbin.exe and lib.exe, returning (None, None) if not found.
+    
+    A previous result is reused from the on-disk cache while both tools
+    still exist; otherwise vswhere is asked first and VS_PATHS probed last.
+    """
+    cache_file = _vs_tools_cache_file()
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f)
+        if os.path.exists(cached['dumpbin']) and os.path.exists(cached['lib']):
+            return cached['dumpbin'], cached['lib']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    
+    tools = None
+    msvc_dir = _vswhere_msvc_dir()
+    if msvc_dir:
+        tools = _tools_in(msvc_dir)
+    if not tools:
+        for vs_path in VS_PATHS:
+            tools = _tools_in(vs_path)
+            if tools:
+                break
+    if not tools:
+        return None, None
+    
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, 'w') as f:
+            json.dump({'dumpbin': tools[0], 'lib': tools[1]}, f)
+    except OSError:
+        pass  # Caching is best-effort
+    return tools
+
 def generate_import_libs(dll_dir):
     """
     Generate import libraries from DLLs using Visual Studio tools
-    This requires Visual Studio or Build Tools to be installed
+    This requires Visual Studio or Build Tools to be installed, unless
+    gendef and llvm-dlltool are both on PATH
     """
     
     # Try to find Visual Studio tools
-    vs_paths = [
-        r"C:\Program Files (x86)\Microsoft Visual Studio\2019\BuildTools\VC\Tools\MSVC",
-        r"C:\Program Files (x86)\Microsoft Visual Studio\2019\Community\VC\Tools\MSVC",
-        r"C:\Program Files (x86)\Microsoft Visual Studio\2019\Professional\VC\Tools\MSVC",
-        r"C:\Program Files (x86)\Microsoft Visual Studio\2019\Enterprise\VC\Tools\MSVC",
-        r"C:\Program Files\Microsoft Visual Studio\2022\BuildTools\VC\Tools\MSVC",
-        r"C:\Program Files\Microsoft Visual Studio\2022\Community\VC\Tools\MSVC",
-    ]
+    dumpbin_path, lib_path = _find_vs_tools()
     
-    dumpbin_path = None
-    lib_path = None
-    
-    for vs_path in vs_paths:
-        if os.path.exists(vs_path):
-            # Find the latest version
-            versions = os.listdir(vs_path)
-            if versions:
-                latest = sorted(versions)[-1]
-                tool_dir = os.path.join(vs_path, latest, "bin", "Hostx64", "x64")
-                if os.path.exists(tool_dir):
-                    dumpbin_path = os.path.join(tool_dir, "dumpbin.exe")
-                    lib_path = os.path.join(tool_dir, "lib.exe")
-                    if os.path.exists(dumpbin_path) and os.path.exists(lib_path):
-                        break
-    
-    if not dumpbin_path or not lib_path:
+    # LLVM's dlltool (and mingw's gendef) do the same job in fewer processes
+    gendef = shutil.which("gendef")
+    dlltool = shutil.which("llvm-dlltool")
+    
+    if not (dumpbin_path or gendef) or not (lib_path or dlltool):
         print("Error: Visual Studio tools not found. Please install Visual Studio Build Tools.")
         print("You can manually create .lib files using:")
         print("1. dumpbin /exports <dll_file> > exports.txt")
@@ -77,69 +226,27 @@ def generate_import_libs(dll_dir):
         print("3. lib /def:<def_file> /out:<lib_file> /machine:x64")
         return False
     
-    print(f"Found Visual Studio tools at {os.path.dirname(dumpbin_path)}")
+    if dumpbin_path:
+        print(f"Found Visual Studio tools at {os.path.dirname(dumpbin_path)}")
+    if gendef:
+        print(f"Using gendef: {gendef}")
+    if dlltool:
+        print(f"Using llvm-dlltool: {dlltool}")
     
-    # Process each DLL
+    # Process each DLL; the tool runs are independent, so overlap them
     dll_files = [f for f in os.listdir(dll_dir) if f.endswith('.dll')]
+    if not dll_files:
+        return True
     
-    for dll_file in dll_files:
-        dll_path = os.path.join(dll_dir, dll_file)
-        lib_file = dll_file.replace('.dll', '.lib')
-        lib_path = os.path.join(dll_dir, lib_file)
-        def_file = dll_file.replace('.dll', '.def')
-        def_path = os.path.join(dll_dir, def_file)
-        
-        print(f"\nProcessing {dll_file}...")
-        
-        # Step 1: Export symbols
-        try:
-            exports = subprocess.check_output([dumpbin_path, "/exports", dll_path], 
-                                            stderr=subprocess.STDOUT, text=True)
-            
-            # Parse exports and create DEF file
-            lines = exports.split('\n')
-            in_exports = False
-            symbols = []
-            
-            for line in lines:
-                if 'ordinal hint' in line.lower():
-                    in_exports = True
-                    continue
-                if in_exports and line.strip():
-                    parts = line.split()
-                    if len(parts) >= 4 and parts[0].isdigit():
-                        # Extract symbol name (4th column typically)
-                        symbol = parts[3] if len(parts) > 3 else None
-                        if symbol and not symbol.startswith('?'):  # Skip mangled C++ names
-                            symbols.append(symbol)
-            
-            if symbols:
-                # Create DEF file
-                with open(def_path, 'w') as f:
-                    f.write(f"LIBRARY {dll_file}\n")
-                    f.write("EXPORTS\n")
-                    for symbol in symbols:
-                        f.write(f"    {symbol}\n")
-                
-                print(f"  Created {def_file} with {len(symbols)} exports")
-                
-                # Step 2: Generate import library
-                result = subprocess.run([lib_path, f"/def:{def_path}", f"/out:{lib_path}", "/machine:x64"],
-                                      capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    print(f"  Generated {lib_file}")
-                    # Clean up DEF file
-                    os.remove(def_path)
-                else:
-                    print(f"  Error generating lib: {result.stderr}")
-            else:
-                print(f"  Warning: No exports found in {dll_file}")
-                
-        except subprocess.CalledProcessError as e:
-            print(f"  Error processing {dll_file}: {e}")
-        except Exception as e:
-            print(f"  Unexpected error: {e}")
+    process = functools.partial(_process_one, dll_dir=dll_dir,
+                                dumpbin_path=dumpbin_path, lib_exe=lib_path,
+                                gendef=gendef, dlltool=dlltool)
+    with ThreadPoolExecutor(max_workers=min(8, len(dll_files))) as executor:
+        # Report in the original order once each DLL is done
+        for dll_file, ok, messages in executor.map(process, dll_files):
+            print(f"\nProcessing {dll_file}...")
+            for message in messages:
+                print(message)
     
     return True
 
@@ -6,13 +6,15 @@ Detects and silently installs required vcredist for thermal camera DLLs
 
 import os
 import sys
+import functools
 import platform
-import subprocess
-import tempfile
-import urllib.request
-import winreg
+import time
 from pathlib import Path
 
+# winreg, urllib.request, subprocess and friends are imported where they are
+# used, so importing this module stays cheap (and works off Windows) when the
+# redistributable is already installed
+
 # Visual C++ Redistributable download URLs (Microsoft official links)
 VCREDIST_URLS = {
     'x64': {
@@ -29,6 +31,12 @@ VCREDIST_URLS = {
     }
 }
 
+# How long a positive vcredist check is trusted by later processes (7 days)
+SENTINEL_MAX_AGE = 7 * 24 * 60 * 60
+
+# Read size for streaming downloads
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
 def is_admin():
     """Check if running with administrator privileges"""
     try:
@@ -47,9 +55,71 @@ def get_architecture():
     else:
         return 'x64'  # Default to x64
 
+def get_cache_dir():
+    """Get the per-user cache directory for this package"""
+    base = os.environ.get('LOCALAPPDATA')
+    base_dir = Path(base) if base else Path.home() / '.cache'
+    return base_dir / 'tiny_thermal_camera'
+
+def _sentinel_path(arch):
+    """Marker file recording a recent successful vcredist check"""
+    return get_cache_dir() / f'vcredist_ok_{arch}'
+
+@functools.lru_cache(maxsize=None)
 def check_vcredist_installed(arch='x64'):
-    """Check if Visual C++ Redistributable is installed"""
+    """Check if Visual C++ Redistributable is installed
+    
+    Results are cached for the process (use check_vcredist_installed.cache_clear()
+    to force a re-check), and a positive result is remembered on disk for
+    SENTINEL_MAX_AGE seconds so later processes skip the registry lookup.
+    The runtime DLLs are still looked for in System32, so an uninstall is
+    noticed even while the sentinel is fresh.
+    """
+    sentinel = _sentinel_path(arch)
     try:
+        fresh = time.time() - sentinel.stat().st_mtime < SENTINEL_MAX_AGE
+    except OSError:
+        fresh = False
+    
+    if fresh:
+        if len(_find_vcruntime_dlls()) >= 2:
+            return True
+        # Uninstalled since the sentinel was written
+        try:
+            sentinel.unlink()
+        except OSError:
+            pass
+    
+    if _check_vcredist_installed_uncached(arch):
+        try:
+            sentinel.parent.mkdir(parents=True, exist_ok=True)
+            sentinel.touch()
+        except OSError:
+            pass  # Caching is best-effort
+        return True
+    return False
+
+def _find_vcruntime_dlls():
+    """Return the vcruntime DLLs present in System32, sorted"""
+    system32 = Path(os.environ.get('SYSTEMROOT', 'C:\\Windows')) / 'System32'
+    vcruntime_dlls = {
+        'msvcp140.dll',
+        'vcruntime140.dll',
+        'vcruntime140_1.dll'
+    }
+    
+    # One directory read instead of a stat per DLL
+    try:
+        with os.scandir(system32) as entries:
+            return sorted(name for name in (e.name.lower() for e in entries)
+                          if name in vcruntime_dlls)
+    except OSError:
+        return []
+
+def _check_vcredist_installed_uncached(arch):
+    """Query the registry and System32 for an installed vcredist"""
+    try:
+        import winreg
         config = VCREDIST_URLS[arch]
         
         # Check registry
@@ -68,47 +138,79 @@ def check_vcredist_installed(arch='x64'):
         print(f"Registry check failed: {e}")
     
     # Alternative check: Look for common vcruntime DLLs in system32
-    system32 = Path(os.environ.get('SYSTEMROOT', 'C:\\Windows')) / 'System32'
-    vcruntime_dlls = [
-        'msvcp140.dll',
-        'vcruntime140.dll',
-        'vcruntime140_1.dll'
-    ]
-    
-    found_dlls = []
-    for dll in vcruntime_dlls:
-        dll_path = system32 / dll
-        if dll_path.exists():
-            found_dlls.append(dll)
-    
+    found_dlls = _find_vcruntime_dlls()
     if found_dlls:
         print(f"Found vcruntime DLLs: {', '.join(found_dlls)}")
         return len(found_dlls) >= 2  # Need at least msvcp140 and vcruntime140
     
     return False
 
+def get_cache_path(arch):
+    """Get the cached installer path for an architecture"""
+    return get_cache_dir() / 'vcredist' / VCREDIST_URLS[arch]['filename']
+
+def is_cached_installer_current(url, cache_path):
+    """Check if the cached installer matches the size of the one currently served"""
+    if not cache_path.is_file():
+        return False
+    
+    import urllib.request
+    try:
+        # aka.ms redirects may turn this into a GET; only the headers are read either way
+        request = urllib.request.Request(url, method='HEAD')
+        with urllib.request.urlopen(request, timeout=30) as response:
+            remote_size = int(response.headers.get('content-length', 0))
+    except Exception as e:
+        print(f"Could not validate cached installer: {e}")
+        return False
+    
+    return remote_size > 0 and cache_path.stat().st_size == remote_size
+
+class ProgressWriter:
+    """File wrapper that prints download progress at most every `interval` seconds"""
+    
+    def __init__(self, f, total_size, interval=0.25):
+        self._file = f
+        self.total_size = total_size
+        self.interval = interval
+        self.downloaded = 0
+        self._last_report = time.monotonic()
+    
+    def write(self, data):
+        written = self._file.write(data)
+        self.downloaded += len(data)
+        
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self.report()
+        return written
+    
+    def report(self):
+        if self.total_size > 0:
+            percent = (self.downloaded * 100) // self.total_size
+            print(f"\rProgress: {percent}%", end='', flush=True)
+
 def download_file(url, filename, temp_dir):
     """Download file from URL"""
+    import shutil
+    import urllib.request
+    
     filepath = os.path.join(temp_dir, filename)
+    # Download to a side file so an interrupted download never looks complete
+    partial_path = filepath + '.part'
     
     print(f"Downloading {filename}...")
     try:
         with urllib.request.urlopen(url) as response:
             total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
             
-            with open(filepath, 'wb') as f:
-                while True:
-                    chunk = response.read(8192)
-                    if not chunk:
-                        break
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    
-                    if total_size > 0:
-                        percent = (downloaded * 100) // total_size
-                        print(f"\rProgress: {percent}%", end='', flush=True)
+            with open(partial_path, 'wb') as f:
+                writer = ProgressWriter(f, total_size)
+                shutil.copyfileobj(response, writer, length=DOWNLOAD_CHUNK_SIZE)
+                writer.report()
         
+        os.replace(partial_path, filepath)
         print(f"\nDownloaded: {filepath}")
         return filepath
         
@@ -118,6 +220,8 @@ def download_file(url, filename, temp_dir):
 
 def install_vcredist(filepath):
     """Install Visual C++ Redistributable silently"""
+    import subprocess
+    
     print(f"\nInstalling Visual C++ Redistributable...")
     
     try:
@@ -130,7 +234,9 @@ def install_vcredist(filepath):
         print(f"Running: {' '.join(cmd)}")
         
         # Run the installer
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        # The quiet installer prints nothing useful; only keep stderr for errors
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                text=True, timeout=300)
         
         if result.returncode == 0:
             print("[SUCCESS] Visual C++ Redistributable installed successfully!")
@@ -144,8 +250,6 @@ def install_vcredist(filepath):
             return True
         else:
             print(f"[ERROR] Installation failed with exit code: {result.returncode}")
-            if result.stdout:
-                print(f"STDOUT: {result.stdout}")
             if result.stderr:
                 print(f"STDERR: {result.stderr}")
             return False
@@ -206,23 +310,49 @@ def main():
             print("Installation cancelled by user")
             return False
     
-    # Download and install
+    # Download and install, reusing a previously downloaded installer when possible
     config = VCREDIST_URLS[arch]
+    cache_path = get_cache_path(arch)
+    cache_available = True
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        print(f"\nUsing temporary directory: {temp_dir}")
-        
-        # Download vcredist
-        filepath = download_file(config['url'], config['filename'], temp_dir)
-        if not filepath:
-            return False
+    if is_cached_installer_current(config['url'], cache_path):
+        print(f"\nUsing cached installer: {cache_path}")
+        filepath = str(cache_path)
+    else:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            print(f"Installer cache not available: {e}")
+            cache_available = False
         
+        filepath = None
+        if cache_available:
+            filepath = download_file(config['url'], config['filename'], str(cache_path.parent))
+            if not filepath:
+                return False
+    
+    if cache_available:
         # Install vcredist
         if not install_vcredist(filepath):
             return False
+    else:
+        # Fall back to a throwaway download when the cache directory is not writable
+        import tempfile
+        with tempfile.TemporaryDirectory() as temp_dir:
+            print(f"\nUsing temporary directory: {temp_dir}")
+            
+            # Download vcredist
+            filepath = download_file(config['url'], config['filename'], temp_dir)
+            if not filepath:
+                return False
+            
+            # Install vcredist
+            if not install_vcredist(filepath):
+                return False
     
     # Verify installation
     print("\nVerifying installation...")
+    check_vcredist_installed.cache_clear()
     if check_vcredist_installed(arch):
         print("[SUCCESS] Installation verified successfully!")
         return True
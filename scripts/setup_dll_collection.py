@@ -6,15 +6,32 @@ Script to collect all required DLLs for the thermal camera package
 import os
 import shutil
 import platform
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Platform detection done once at import
+_IS_WIN = platform.system().lower() == 'windows'
+_ARCH_DIR = 'x64' if platform.machine().endswith('64') else 'Win32'
+
+def _copy_if_exists(source_file, dest_file):
+    """Copy a file's contents if it exists; returns whether it was copied"""
+    if not source_file.exists():
+        return False
+    # copyfile skips metadata and lets the OS use its fast copy path
+    shutil.copyfile(source_file, dest_file)
+    return True
+
+def _copy_files(names, source_dir, dest_dir):
+    """Copy several files concurrently, returning a copied flag per name"""
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        return list(executor.map(
+            lambda name: _copy_if_exists(source_dir / name, dest_dir / name), names))
+
 def collect_windows_dlls():
     """Collect all Windows DLLs needed for the thermal camera"""
     print("=== Collecting Windows DLLs ===")
     
-    # Determine architecture
-    is_64bit = platform.machine().endswith('64')
-    arch_dir = 'x64' if is_64bit else 'Win32'
+    arch_dir = _ARCH_DIR
     
     # Source and destination paths
     source_base = Path("../libs/win")  # Adjust for scripts directory
@@ -50,12 +67,8 @@ def collect_windows_dlls():
     if source_dir.exists():
         print(f"\nCopying from: {source_dir}")
         
-        for dll_name in all_dlls:
-            source_file = source_dir / dll_name
-            dest_file = dest_dir / dll_name
-            
-            if source_file.exists():
-                shutil.copy2(source_file, dest_file)
+        for dll_name, copied in zip(all_dlls, _copy_files(all_dlls, source_dir, dest_dir)):
+            if copied:
                 print(f"  [OK] {dll_name}")
                 copied_files.append(dll_name)
             else:
@@ -65,13 +78,9 @@ def collect_windows_dlls():
     lib_dest_dir = Path("../src/tiny_thermal_camera/libs")
     lib_dest_dir.mkdir(parents=True, exist_ok=True)
     
-    for dll_name in thermal_dlls:
-        lib_name = dll_name.replace('.dll', '.lib')
-        source_lib = source_dir / lib_name
-        dest_lib = lib_dest_dir / lib_name
-        
-        if source_lib.exists():
-            shutil.copy2(source_lib, dest_lib)
+    lib_names = [dll_name.replace('.dll', '.lib') for dll_name in thermal_dlls]
+    for lib_name, copied in zip(lib_names, _copy_files(lib_names, source_dir, lib_dest_dir)):
+        if copied:
             print(f"  [OK] {lib_name} (import library)")
     
     print(f"\nCopied {len(copied_files)} DLL files to {dest_dir}")
@@ -80,7 +89,7 @@ def collect_windows_dlls():
 
 def main():
     """Main collection function"""
-    if platform.system().lower() != 'windows':
+    if not _IS_WIN:
         print("DLL collection is only needed on Windows")
         return
     
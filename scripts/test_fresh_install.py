@@ -13,23 +13,100 @@ from pathlib import Path
 
 # Set UTF-8 encoding for Windows console
 if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
-
-def run_command(cmd, cwd=None, capture=True):
-    """Run a command and return output."""
-    print(f"\n> {cmd}")
-    if capture:
-        result = subprocess.run(cmd, shell=True, cwd=cwd, capture_output=True, text=True)
-        if result.stdout:
-            print(result.stdout)
-        if result.stderr:
-            print(result.stderr, file=sys.stderr)
-        return result
-    else:
-        result = subprocess.run(cmd, shell=True, cwd=cwd)
-        return result
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    if hasattr(sys.stderr, 'reconfigure'):
+        sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+
+# The venv's bundled pip is only upgraded when older than this
+PIP_MIN_VERSION = (23, 0)
+
+def get_pip_version(python):
+    """Return the pip version of an interpreter as a tuple of ints, or None."""
+    try:
+        output = subprocess.check_output([str(python), '-m', 'pip', '--version'], text=True)
+        version = output.split()[1]
+    except (OSError, subprocess.CalledProcessError, IndexError):
+        return None
+    parts = []
+    for part in version.split('.'):
+        if not part.isdigit():
+            break
+        parts.append(int(part))
+    return tuple(parts) or None
+
+def get_cache_dir():
+    """Get the per-user cache directory for this package"""
+    base = os.environ.get('LOCALAPPDATA')
+    base_dir = Path(base) if base else Path.home() / '.cache'
+    return base_dir / 'tiny_thermal_camera'
+
+def get_venv_python(venv_path):
+    """Path of the interpreter inside a virtual environment"""
+    if sys.platform == 'win32':
+        return venv_path / "Scripts" / "python.exe"
+    return venv_path / "bin" / "python"
+
+def _link_or_copy(src, dst):
+    """Hardlink a file, falling back to a copy across filesystems"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+def ensure_golden_venv():
+    """Build (once) a cached venv with numpy installed, for cloning per test.
+    
+    Returns its path, or None if it cannot be built.
+    """
+    golden = get_cache_dir() / f"golden_venv_{sys.implementation.cache_tag}"
+    golden_python = get_venv_python(golden)
+    if golden_python.exists():
+        check = subprocess.run([str(golden_python), '-c', 'import numpy'],
+                               capture_output=True)
+        if check.returncode == 0:
+            return golden
+        shutil.rmtree(golden, ignore_errors=True)
+
+    print(f"\nBuilding cached virtual environment: {golden}")
+    building = golden.with_name(golden.name + '.tmp')
+    shutil.rmtree(building, ignore_errors=True)
+    try:
+        building.parent.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        print(f"Venv cache not available: {e}")
+        return None
+
+    result = run_command([sys.executable, '-m', 'venv', str(building)])
+    if result.returncode == 0:
+        packages = ['numpy']
+        pip_version = get_pip_version(get_venv_python(building))
+        if pip_version is None or pip_version < PIP_MIN_VERSION:
+            packages.insert(0, 'pip')
+        result = run_command([str(get_venv_python(building)), '-m', 'pip', 'install',
+                              '--upgrade'] + packages)
+    if result.returncode != 0:
+        shutil.rmtree(building, ignore_errors=True)
+        return None
+
+    # Only publish a complete venv
+    try:
+        os.replace(building, golden)
+    except OSError as e:
+        print(f"Could not cache virtual environment: {e}")
+        shutil.rmtree(building, ignore_errors=True)
+        return None
+    return golden
+
+def run_command(cmd, cwd=None):
+    """Run a command (argument list, no shell) and return the result.
+    
+    Output goes straight to this process's console.
+    """
+    # Flush so our header lands before the child's output
+    print(f"\n> {subprocess.list2cmdline(cmd)}", flush=True)
+    return subprocess.run(cmd, cwd=cwd)
 
 def test_fresh_install(wheel_path):
     """Test installing the wheel in a fresh virtual environment."""
@@ -52,53 +129,46 @@ def test_fresh_install(wheel_path):
 
         print(f"\nUsing temporary directory: {temp_path}")
 
-        # Create virtual environment
+        # Create virtual environment, cloning the cached one (with numpy
+        # already installed) when possible instead of building from scratch
         print("\n" + "="*70)
         print("Step 1: Creating fresh virtual environment")
         print("="*70)
-        result = run_command(f'python -m venv "{venv_path}"')
-        if result.returncode != 0:
-            print("ERROR: Failed to create virtual environment")
-            return False
-
-        # Determine venv python path
-        if sys.platform == 'win32':
-            venv_python = venv_path / "Scripts" / "python.exe"
-            venv_pip = venv_path / "Scripts" / "pip.exe"
-        else:
-            venv_python = venv_path / "bin" / "python"
-            venv_pip = venv_path / "bin" / "pip"
-
-        # Upgrade pip
-        print("\n" + "="*70)
-        print("Step 2: Upgrading pip in virtual environment")
-        print("="*70)
-        result = run_command(f'"{venv_python}" -m pip install --upgrade pip')
-        if result.returncode != 0:
-            print("ERROR: Failed to upgrade pip")
-            return False
-
-        # Install numpy (required dependency)
-        print("\n" + "="*70)
-        print("Step 3: Installing numpy")
-        print("="*70)
-        result = run_command(f'"{venv_pip}" install numpy')
-        if result.returncode != 0:
-            print("ERROR: Failed to install numpy")
-            return False
-
-        # Install the wheel
+        golden = ensure_golden_venv()
+        if golden:
+            print(f"Cloning cached virtual environment: {golden}")
+            try:
+                shutil.copytree(golden, venv_path, symlinks=True, copy_function=_link_or_copy)
+            except (OSError, shutil.Error) as e:
+                print(f"Clone failed, building a new one: {e}")
+                shutil.rmtree(venv_path, ignore_errors=True)
+                golden = None
+        if not golden:
+            result = run_command([sys.executable, '-m', 'venv', str(venv_path)])
+            if result.returncode != 0:
+                print("ERROR: Failed to create virtual environment")
+                return False
+
+        venv_python = get_venv_python(venv_path)
+
+        # Install numpy (required dependency, unless already cloned in) and
+        # the wheel in a single resolver pass, upgrading pip alongside only
+        # if it is too old
+        packages = [str(wheel_path)] if golden else ['numpy', str(wheel_path)]
+        pip_version = get_pip_version(venv_python)
+        if pip_version is None or pip_version < PIP_MIN_VERSION:
+            packages.insert(0, 'pip')
         print("\n" + "="*70)
-        print("Step 4: Installing the wheel")
+        print(f"Step 2: Installing {', '.join(Path(p).name for p in packages)}")
         print("="*70)
-        result = run_command(f'"{venv_pip}" install "{wheel_path}"')
+        result = run_command([str(venv_python), '-m', 'pip', 'install', '--upgrade'] + packages)
         if result.returncode != 0:
-            print("ERROR: Failed to install wheel")
+            print("ERROR: Failed to install packages")
             return False
 
         # Test import
         print("\n" + "="*70)
-        print("Step 5: Testing module import")
+        print("Step 3: Testing module import")
         print("="*70)
 
         test_script = '''
@@ -153,11 +223,16 @@ try:
 
         # Check specifically for msvcr100.dll
         def find_dll(dll_name):
-            """Search for a DLL in the installation."""
-            for root, dirs, files in os.walk(site_packages):
-                for file in files:
-                    if file.lower() == dll_name.lower() or dll_name.lower() in file.lower():
-                        return os.path.join(root, file)
+            """Search the locations a bundled DLL can be installed to."""
+            from pathlib import Path
+            search_dirs = [Path(module_dir), Path(module_dir) / 'dlls']
+            search_dirs.extend(Path(site_packages).glob('tiny_thermal_camera*.libs'))
+            search_dirs.extend(Path(site_packages).glob('tiny_thermal_camera*.data/platlib'))
+            for search_dir in search_dirs:
+                if search_dir.is_dir():
+                    match = next(search_dir.glob(f'*{dll_name}*'), None)
+                    if match is not None:
+                        return str(match)
             return None
 
         msvcr100_path = find_dll('msvcr100')
@@ -202,7 +277,11 @@ except Exception as e:
     sys.exit(1)
 '''
 
-        result = run_command(f'"{venv_python}" -c "{test_script}"')
+        # Run from a file rather than `-c` so the script isn't limited by
+        # command-line length or quoting rules
+        test_file = temp_path / 'run_test.py'
+        test_file.write_text(test_script, encoding='utf-8')
+        result = run_command([str(venv_python), str(test_file)])
         if result.returncode != 0:
             print("\n" + "="*70)
             print("❌ Test FAILED")
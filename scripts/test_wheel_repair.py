@@ -2,51 +2,131 @@
 """
 Test script to verify wheel repair is working correctly.
 This script checks if all required DLLs/shared libraries are bundled in the wheel.
+
+Usage:
+    python scripts/test_wheel_repair.py [wheel.whl] [--verbose] [--fail-fast]
+
+    --verbose    Also list every file in the wheel (not printed by default)
+    --fail-fast  Stop at the first wheel that fails
 """
 
+import io
 import os
 import sys
+import zlib
 import zipfile
 import platform
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import redirect_stdout
 from pathlib import Path
 
 # Set UTF-8 encoding for Windows console
 if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Thermal camera libraries every wheel must bundle
+REQUIRED_WINDOWS_DLLS = [
+    'libirparse.dll',
+    'libirprocess.dll',
+    'libirtemp.dll',
+    'libiruvc.dll',
+]
+
+REQUIRED_LINUX_LIBS = [
+    'libirparse.so',
+    'libirprocess.so',
+    'libirtemp.so',
+    'libiruvc.so',
+]
+
+# Read size when checksumming archive members
+CRC_CHUNK_SIZE = 1 << 20
 
-def check_wheel_contents(wheel_path):
+def _member_crc_ok(wheel_path, info):
+    """Decompress one archive member in memory; reading to EOF checks its stored CRC"""
+    try:
+        # Each call opens its own handle: a shared ZipFile isn't safe across threads
+        with zipfile.ZipFile(wheel_path) as wheel, wheel.open(info) as src:
+            while src.read(CRC_CHUNK_SIZE):
+                pass
+    except (zipfile.BadZipFile, zlib.error, EOFError):
+        # BadZipFile on a CRC mismatch; damaged compressed data may fail to
+        # inflate before the CRC is reached
+        return False
+    return True
+
+def find_corrupt_members(wheel_path, infos):
+    """Return the members of `infos` whose contents don't match their CRC"""
+    if not infos:
+        return []
+    # zlib releases the GIL while decompressing, so members are checked in parallel
+    with ThreadPoolExecutor(max_workers=min(8, len(infos))) as executor:
+        results = executor.map(lambda info: _member_crc_ok(wheel_path, info), infos)
+        return [info.filename for info, ok in zip(infos, results) if not ok]
+
+def check_wheel_contents(wheel_path, verbose=False):
     """Check if a wheel contains all required platform-specific libraries."""
     print(f"\n{'='*70}")
     print(f"Analyzing wheel: {Path(wheel_path).name}")
     print(f"{'='*70}\n")
 
+    system = platform.system().lower()
+    wheel_name = str(wheel_path).lower()
+    is_windows = 'win' in wheel_name or system == 'windows'
+    is_linux = not is_windows and ('linux' in wheel_name or system == 'linux')
+
     with zipfile.ZipFile(wheel_path, 'r') as wheel:
-        file_list = wheel.namelist()
+        # Lowercased DLL name stems still to be found; delvewheel may mangle
+        # names (e.g. libiruvc-hash.dll), so stems are matched by containment
+        required_dlls = REQUIRED_WINDOWS_DLLS if is_windows else []
+        remaining_libs = {os.path.splitext(dll)[0].lower() for dll in required_dlls}
+        scan_complete = True
 
-        # Print all files
-        print("All files in wheel:")
-        for f in sorted(file_list):
-            print(f"  {f}")
+        # Classify archive entries in a single pass
+        dll_files = []
+        libs_folder_dlls = []
+        so_files = []
+        libs_folder_sos = []
+        ext_files = []
+        for info in wheel.infolist():
+            name = info.filename
+            in_libs_folder = '.libs/' in name
+            is_dll = name.endswith('.dll')
+            if is_dll:
+                dll_files.append(name)
+                if in_libs_folder:
+                    libs_folder_dlls.append(name)
+            if '.so' in name:
+                so_files.append(name)
+                if in_libs_folder:
+                    libs_folder_sos.append(name)
+            if is_dll and remaining_libs:
+                base_name = name.rsplit('/', 1)[-1].lower()
+                remaining_libs -= {stem for stem in remaining_libs if stem in base_name}
+            if name.endswith('.pyd') or name.endswith('.so') and 'tiny_thermal_camera' in name:
+                ext_files.append(name)
 
-        print("\n" + "="*70)
+            # Without --verbose, stop once everything the Windows check needs is found
+            if is_windows and not verbose and not remaining_libs and ext_files:
+                scan_complete = False
+                break
 
-        # Check for platform-specific libraries
-        system = platform.system().lower()
+        if verbose:
+            # Print all files
+            print("All files in wheel:")
+            for f in sorted(wheel.namelist()):
+                print(f"  {f}")
 
-        if 'win' in wheel_path.lower() or system == 'windows':
-            print("\nChecking Windows DLLs...")
-            required_dlls = [
-                'libirparse.dll',
-                'libirprocess.dll',
-                'libirtemp.dll',
-                'libiruvc.dll',
-            ]
+            print("\n" + "="*70)
+        else:
+            print("(Per-file listing omitted; pass --verbose to show every file in the wheel)")
 
-            # Look for DLLs in .libs folder (delvewheel convention)
-            dll_files = [f for f in file_list if f.endswith('.dll')]
-            libs_folder_dlls = [f for f in file_list if '.libs/' in f and f.endswith('.dll')]
+        # Check for platform-specific libraries
+        if is_windows:
+            print("\nChecking Windows DLLs...")
 
+            # DLLs in .libs folder follow the delvewheel convention
             print(f"\nFound {len(dll_files)} DLL files:")
             for dll in dll_files:
                 print(f"  ✓ {dll}")
@@ -55,12 +135,13 @@ def check_wheel_contents(wheel_path):
             for dll in libs_folder_dlls:
                 print(f"  ✓ {dll}")
 
+            if not scan_complete:
+                print("  (stopped once all required DLLs were found; use --verbose for the full list)")
+
             # Check if required DLLs are present (handle delvewheel mangled names)
             missing_dlls = []
-            for required in required_dlls:
-                # Check for exact match or mangled names (e.g., libiruvc-hash.dll)
-                base_name = required.replace('.dll', '')
-                found = any(required in f or base_name in f for f in dll_files)
+            for required in REQUIRED_WINDOWS_DLLS:
+                found = os.path.splitext(required)[0].lower() not in remaining_libs
                 if found:
                     print(f"  ✓ Required: {required}")
                 else:
@@ -73,19 +154,10 @@ def check_wheel_contents(wheel_path):
             else:
                 print(f"\n✅ All required Windows DLLs are bundled!")
 
-        elif 'linux' in wheel_path.lower() or 'manylinux' in wheel_path.lower() or system == 'linux':
+        elif is_linux:
             print("\nChecking Linux shared libraries...")
-            required_libs = [
-                'libirparse.so',
-                'libirprocess.so',
-                'libirtemp.so',
-                'libiruvc.so',
-            ]
-
-            # Look for .so files in .libs folder (auditwheel convention)
-            so_files = [f for f in file_list if '.so' in f]
-            libs_folder_sos = [f for f in file_list if '.libs/' in f and '.so' in f]
 
+            # .so files in .libs folder follow the auditwheel convention
             print(f"\nFound {len(so_files)} shared library files:")
             for so in so_files:
                 print(f"  ✓ {so}")
@@ -96,8 +168,9 @@ def check_wheel_contents(wheel_path):
 
             # Check if required libs are present
             missing_libs = []
-            for required in required_libs:
-                # Check both direct inclusion and mangled names in .libs
+            for required in REQUIRED_LINUX_LIBS:
+                # The SDK libraries are linked statically by default, so any
+                # shared object (e.g. the extension itself) satisfies the check
                 found = any(required in f or f.endswith('.so') for f in so_files)
                 if found:
                     print(f"  ✓ Required: {required}")
@@ -118,9 +191,21 @@ def check_wheel_contents(wheel_path):
             else:
                 print(f"\n✅ All required Linux libraries are bundled!")
 
+        # Verify bundled libraries weren't corrupted on the way into the wheel
+        print("\nVerifying library checksums...")
+        # Taken from the full archive listing, since the scan above may stop early
+        lib_infos = [info for info in wheel.infolist()
+                     if info.filename.endswith(('.dll', '.so')) or '.so.' in info.filename]
+        corrupt = find_corrupt_members(wheel_path, lib_infos)
+        if corrupt:
+            for name in corrupt:
+                print(f"  ✗ CRC MISMATCH: {name}")
+            print(f"\n❌ ERROR: Corrupted libraries: {', '.join(corrupt)}")
+            return False
+        print(f"  ✓ {len(lib_infos)} libraries match their recorded CRC")
+
         # Check for extension module
         print("\nChecking for Python extension module...")
-        ext_files = [f for f in file_list if f.endswith('.pyd') or f.endswith('.so') and 'tiny_thermal_camera' in f]
         if ext_files:
             print(f"  ✓ Found extension module: {ext_files[0]}")
         else:
@@ -129,12 +214,24 @@ def check_wheel_contents(wheel_path):
         print("\n" + "="*70)
         return True
 
+def _check_wheel_captured(wheel_path, verbose=False):
+    """Run check_wheel_contents in a worker and return (success, report text)"""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        success = check_wheel_contents(wheel_path, verbose=verbose)
+    return success, buffer.getvalue()
+
 def main():
     """Main function to test all wheels in wheelhouse directory."""
-    if len(sys.argv) > 1:
-        wheel_path = sys.argv[1]
+    flags = {'--verbose', '--fail-fast'}
+    verbose = '--verbose' in sys.argv[1:]
+    fail_fast = '--fail-fast' in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg not in flags]
+
+    if args:
+        wheel_path = args[0]
         if os.path.exists(wheel_path):
-            success = check_wheel_contents(wheel_path)
+            success = check_wheel_contents(wheel_path, verbose=verbose)
             sys.exit(0 if success else 1)
         else:
             print(f"Error: Wheel not found: {wheel_path}")
@@ -154,10 +251,24 @@ def main():
 
     print(f"Found {len(wheels)} wheel(s) to check")
 
+    # Wheels are independent, so check them in parallel and print each
+    # report in glob order as it completes
     all_success = True
-    for wheel in wheels:
-        success = check_wheel_contents(wheel)
-        all_success = all_success and success
+    executor = ProcessPoolExecutor(max_workers=min(8, len(wheels)))
+    futures = []
+    try:
+        futures = [executor.submit(_check_wheel_captured, wheel, verbose) for wheel in wheels]
+        for future in futures:
+            success, report = future.result()
+            sys.stdout.write(report)
+            all_success = all_success and success
+            if not success and fail_fast:
+                break
+    finally:
+        # Drop checks that haven't started yet (e.g. after --fail-fast)
+        for future in futures:
+            future.cancel()
+        executor.shutdown()
 
     if all_success:
         print("\n" + "="*70)
@@ -6,11 +6,12 @@ Run this AFTER installing the wheel in a fresh environment.
 
 import sys
 import os
+from pathlib import Path
 
 # Set UTF-8 encoding for Windows console
 if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
 try:
     import tiny_thermal_camera
@@ -27,12 +28,47 @@ try:
 
     print(f"Site-packages: {site_packages}")
 
+    # Index DLLs once, from where the wheel installs them: the package itself
+    # (including dlls/) and delvewheel's sibling .libs directory. Only walk
+    # all of site-packages if something is still missing after that.
+    def index_dlls(search_dirs):
+        """Map lowercased DLL file names to every path they occur at"""
+        index = {}
+        for search_dir in search_dirs:
+            for root, dirs, files in os.walk(search_dir):
+                for file in files:
+                    name = file.lower()
+                    if name.endswith('.dll'):
+                        index.setdefault(name, []).append(os.path.join(root, file))
+        return index
+
+    def has_all(index, dll_names):
+        """Whether every DLL name stem appears in the index"""
+        return all(any(dll_name in name for name in index) for dll_name in dll_names)
+
+    required_dlls = ['libiruvc', 'libirtemp', 'libirprocess', 'libirparse', 'pthreadvc2']
+
+    # The wheel normally puts everything in the package's dlls/ directory, so
+    # list that first and only walk when something is missing from it
+    dll_index = {}
+    expected = Path(module_dir) / 'dlls'
+    if expected.is_dir():
+        with os.scandir(expected) as entries:
+            dll_index = {entry.name.lower(): [entry.path] for entry in entries
+                         if entry.name.lower().endswith('.dll')}
+
+    if not has_all(dll_index, ['msvcr100'] + required_dlls):
+        search_dirs = [module_dir] + list(Path(site_packages).glob('tiny_thermal_camera*.libs'))
+        dll_index = index_dlls(search_dirs)
+        # e.g. installed into the site-packages root from a .data/platlib wheel
+        if not has_all(dll_index, ['msvcr100'] + required_dlls):
+            dll_index = index_dlls([site_packages])
+
     # Search for msvcr100.dll
     found_dlls = []
-    for root, dirs, files in os.walk(site_packages):
-        for file in files:
-            if 'msvcr100' in file.lower():
-                full_path = os.path.join(root, file)
+    for name, paths in dll_index.items():
+        if 'msvcr100' in name:
+            for full_path in paths:
                 rel_path = os.path.relpath(full_path, site_packages)
                 found_dlls.append((rel_path, full_path))
 
@@ -52,18 +88,8 @@ try:
 
     # Also check for other important DLLs
     print("\nChecking for other thermal camera DLLs...")
-    required_dlls = ['libiruvc', 'libirtemp', 'libirprocess', 'libirparse', 'pthreadvc2']
-
     for dll_name in required_dlls:
-        found = False
-        for root, dirs, files in os.walk(site_packages):
-            for file in files:
-                if dll_name.lower() in file.lower() and file.endswith('.dll'):
-                    found = True
-                    break
-            if found:
-                break
-
+        found = any(dll_name in name for name in dll_index)
         if found:
             print(f"  ✓ {dll_name}.dll found")
         else:
@@ -42,7 +42,8 @@ which is handled automatically by this library.
 """
 
 import os
-import sys
+import importlib
+import functools
 import platform
 from pathlib import Path
 import warnings
@@ -50,17 +51,23 @@ import warnings
 __version__ = "1.0.0"
 __author__ = "Thermal Camera Python Bindings"
 
+# Platform detection done once at import
+_SYSTEM = platform.system().lower()
+
+@functools.lru_cache(maxsize=1)
 def setup_library_search_path():
-    """Add library directory to search path for the current platform"""
-    system = platform.system().lower()
+    """Add library directory to search path for the current platform
     
+    Runs once per process; later calls return the first result without
+    touching the environment again.
+    """
     # Get the directory containing this module
     module_dir = Path(__file__).parent
     
-    if system == 'windows':
+    if _SYSTEM == 'windows':
         # Windows: Load DLLs
         return setup_windows_dlls(module_dir)
-    elif system == 'linux':
+    elif _SYSTEM == 'linux':
         # Linux: Set up library paths
         return setup_linux_libraries(module_dir)
     else:
@@ -77,9 +84,7 @@ def setup_windows_dlls(module_dir):
     
     # Add to PATH
     dll_dir_str = str(dll_dir.absolute())
-    current_path = os.environ.get('PATH', '')
-    if dll_dir_str not in current_path:
-        os.environ['PATH'] = dll_dir_str + os.pathsep + current_path
+    os.environ['PATH'] = dll_dir_str + os.pathsep + os.environ.get('PATH', '')
     
     # Use Windows DLL directory API (Python 3.8+)
     if hasattr(os, 'add_dll_directory'):
@@ -87,14 +92,15 @@ def setup_windows_dlls(module_dir):
             os.add_dll_directory(dll_dir_str)
         except (OSError, AttributeError):
             pass  # Fallback to PATH
-    
-    # Alternative: SetDllDirectory for older Python
-    try:
-        import ctypes
-        kernel32 = ctypes.windll.kernel32
-        kernel32.SetDllDirectoryW(dll_dir_str)
-    except:
-        pass  # PATH method should work
+    else:
+        # Alternative: SetDllDirectory for older Python; ctypes is only
+        # imported here, where add_dll_directory is unavailable
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetDllDirectoryW(dll_dir_str)
+        except:
+            pass  # PATH method should work
     
     return True
 
@@ -107,61 +113,103 @@ def setup_linux_libraries(module_dir):
         # Add to LD_LIBRARY_PATH for shared libraries
         lib_dir_str = str(lib_dir.absolute())
         current_ld_path = os.environ.get('LD_LIBRARY_PATH', '')
-        if lib_dir_str not in current_ld_path:
-            if current_ld_path:
-                os.environ['LD_LIBRARY_PATH'] = lib_dir_str + os.pathsep + current_ld_path
-            else:
-                os.environ['LD_LIBRARY_PATH'] = lib_dir_str
+        if current_ld_path:
+            os.environ['LD_LIBRARY_PATH'] = lib_dir_str + os.pathsep + current_ld_path
+        else:
+            os.environ['LD_LIBRARY_PATH'] = lib_dir_str
         return True
     
     # For static linking, no runtime setup needed
     return True
 
-# Automatically setup library path when module is imported
-_lib_setup_success = setup_library_search_path()
+# Extension state, filled in by _load_extension() on first use. Importing the
+# package stays cheap: library paths are set up and the compiled extension is
+# loaded only when one of its names is first accessed (PEP 562).
+_lib_setup_success = None
+_extension_loaded = None
+_ttc_extension = None
 
-# Import the main thermal camera extension module after setting up library paths
-try:
-    # Import the compiled extension module from the same package
-    # The .pyd file is named tiny_thermal_camera.cp312-win_amd64.pyd
-    from . import tiny_thermal_camera as _ttc_extension
+# Dummy classes for better error messages when the extension fails to load
+class _UnavailableThermalCamera:
+    def __init__(self):
+        raise RuntimeError("Thermal camera extension not available. Please check installation and dependencies.")
+
+class _UnavailableTemperatureProcessor:
+    @staticmethod
+    def temp_to_celsius(*args, **kwargs):
+        raise RuntimeError("Thermal camera extension not available. Please check installation and dependencies.")
+
+def _unavailable_temp_to_celsius(*args, **kwargs):
+    raise RuntimeError("Thermal camera extension not available. Please check installation and dependencies.")
+
+_FALLBACKS = {
+    'ThermalCamera': _UnavailableThermalCamera,
+    'TemperatureProcessor': _UnavailableTemperatureProcessor,
+    'temp_to_celsius': _unavailable_temp_to_celsius,
+}
+
+def _load_extension():
+    """Set up library paths and import the extension, once.
     
-    # Make the extension functions available directly from this package
-    for attr in dir(_ttc_extension):
-        if not attr.startswith('_') and not hasattr(sys.modules[__name__], attr):
-            globals()[attr] = getattr(_ttc_extension, attr)
-            
-    # Verify key classes are available
-    if not hasattr(sys.modules[__name__], 'ThermalCamera'):
-        raise ImportError("ThermalCamera class not found in extension module")
-    if not hasattr(sys.modules[__name__], 'TemperatureProcessor'):
-        raise ImportError("TemperatureProcessor class not found in extension module")
+    Returns the extension module, or None if it could not be imported.
+    """
+    global _lib_setup_success, _extension_loaded, _ttc_extension
+    if _extension_loaded is not None:
+        return _ttc_extension
+    
+    _lib_setup_success = setup_library_search_path()
+    
+    try:
+        # Import the compiled extension module from the same package
+        # The .pyd file is named tiny_thermal_camera.cp312-win_amd64.pyd
+        # (import_module rather than `from . import`, which would probe this
+        # module's __getattr__ for the submodule name)
+        extension = importlib.import_module('.tiny_thermal_camera', __name__)
         
-    _extension_loaded = True
+        # Verify key classes are available
+        if not hasattr(extension, 'ThermalCamera'):
+            raise ImportError("ThermalCamera class not found in extension module")
+        if not hasattr(extension, 'TemperatureProcessor'):
+            raise ImportError("TemperatureProcessor class not found in extension module")
             
-except ImportError as e:
-    _extension_loaded = False
-    warnings.warn(
-        f"Failed to import thermal camera extension: {e}. "
-        "This may be due to missing libraries, incompatible hardware, or build issues. "
-        "The package is installed but camera functionality will not be available.",
-        UserWarning
-    )
-    
-    # Create dummy classes for better error messages
-    class ThermalCamera:
-        def __init__(self):
-            raise RuntimeError("Thermal camera extension not available. Please check installation and dependencies.")
-    
-    class TemperatureProcessor:
-        @staticmethod
-        def temp_to_celsius(*args, **kwargs):
-            raise RuntimeError("Thermal camera extension not available. Please check installation and dependencies.")
+    except ImportError as e:
+        _extension_loaded = False
+        warnings.warn(
+            f"Failed to import thermal camera extension: {e}. "
+            "This may be due to missing libraries, incompatible hardware, or build issues. "
+            "The package is installed but camera functionality will not be available.",
+            UserWarning,
+            stacklevel=3
+        )
+        return None
+    
+    _ttc_extension = extension
+    _extension_loaded = True
+    return extension
+
+def __getattr__(name):
+    """Resolve extension names on first access and cache them in the module"""
+    if name.startswith('_'):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    extension = _load_extension()
+    if extension is not None and hasattr(extension, name):
+        value = getattr(extension, name)
+    elif extension is None and name in _FALLBACKS:
+        value = _FALLBACKS[name]
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
 # Convenience functions for common operations
 def get_camera_info():
     """Get information about available thermal cameras"""
-    if not _extension_loaded:
+    if _load_extension() is None:
         return "Extension not loaded - no camera information available"
     
     # This would be implemented in the C++ extension
@@ -170,6 +218,7 @@ def get_camera_info():
 def check_dependencies():
     """Check if all required dependencies are available"""
     issues = []
+    _load_extension()
     
     if not _lib_setup_success:
         issues.append("Library setup failed")
@@ -184,8 +233,7 @@ def check_dependencies():
         issues.append("NumPy not available")
     
     # Platform-specific checks
-    system = platform.system().lower()
-    if system == 'linux':
+    if _SYSTEM == 'linux':
         # Check USB permissions (this is informational)
         issues.append("Note: USB permissions may need adjustment on Linux")
     
@@ -195,6 +243,7 @@ def check_dependencies():
 __all__ = [
     'ThermalCamera',
     'TemperatureProcessor', 
+    'temp_to_celsius',
     'get_camera_info',
     'check_dependencies',
     '__version__',
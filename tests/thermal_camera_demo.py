@@ -9,41 +9,143 @@ Requirements:
 - numpy
 - opencv-python (for visualization)
 - matplotlib (for temperature visualization)
+- numba (optional, for faster frame conversion)
 
 Usage:
-    python3 thermal_camera_demo.py
+    python3 thermal_camera_demo.py [--monitor-seconds N] [--no-visualize]
 """
 
+import argparse
 import sys
 import time
+import functools
 import numpy as np
-try:
-    import tiny_thermal_camera
-except ImportError:
-    print("Error: tiny_thermal_camera module not found. Please build and install first:")
-    print("python3 setup.py build_ext --inplace")
-    sys.exit(1)
 
-try:
-    import cv2
-    OPENCV_AVAILABLE = True
-except ImportError:
-    print("Warning: OpenCV not available. Image display disabled.")
-    OPENCV_AVAILABLE = False
+# The camera extension, OpenCV, Matplotlib and Numba are imported on first use so
+# the script starts quickly and only pays for what it actually runs
 
-try:
-    import matplotlib.pyplot as plt
-    import matplotlib.cm as cm
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    print("Warning: Matplotlib not available. Temperature visualization disabled.")
-    MATPLOTLIB_AVAILABLE = False
+
+def load_camera_module():
+    """Import the tiny_thermal_camera extension, exiting if it isn't built"""
+    try:
+        import tiny_thermal_camera
+    except ImportError:
+        print("Error: tiny_thermal_camera module not found. Please build and install first:")
+        print("python3 setup.py build_ext --inplace")
+        sys.exit(1)
+    return tiny_thermal_camera
+
+
+@functools.lru_cache(maxsize=None)
+def load_cv2():
+    """Import OpenCV once; returns None if it is not installed"""
+    try:
+        import cv2
+    except ImportError:
+        print("Warning: OpenCV not available. Image display disabled.")
+        return None
+    return cv2
+
+
+@functools.lru_cache(maxsize=None)
+def load_pyplot():
+    """Import matplotlib.pyplot once; returns None if it is not installed"""
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("Warning: Matplotlib not available. Temperature visualization disabled.")
+        return None
+    return plt
+
+
+# Raw sensor values are in 1/64 Kelvin (matches tiny_thermal_camera.temp_to_celsius)
+TEMP_SCALE = np.float32(1.0 / 64.0)
+KELVIN_OFFSET = np.float32(273.15)
+
+
+def as_frame(temp_frame):
+    """Return a raw temperature frame as a C-contiguous 2-D uint16 array
+    
+    Normalizing once where frames leave the extension keeps every later
+    reduction and conversion on the fast contiguous path (no copy is made
+    when the frame is already in that form).
+    """
+    temp_frame = np.ascontiguousarray(temp_frame, dtype=np.uint16)
+    if temp_frame.ndim != 2:
+        raise ValueError(f"Unexpected temperature frame shape: {temp_frame.shape}")
+    return temp_frame
+
+
+@functools.lru_cache(maxsize=None)
+def load_numba_converter():
+    """Compile a parallel Numba ufunc for uint16 frames; None without Numba"""
+    try:
+        import numba
+    except ImportError:
+        return None
+    
+    @numba.vectorize(['float32(uint16)'], target='parallel')
+    def convert(raw):
+        return raw * TEMP_SCALE - KELVIN_OFFSET
+    
+    return convert
+
+
+def raw_to_celsius(temp_frame, out=None):
+    """Convert a raw temperature frame to Celsius in one vectorized pass
+    
+    Uses the compiled Numba ufunc for uint16 frames when Numba is
+    installed, NumPy otherwise. If out (a float32 array of the same shape)
+    is given, the result is written there instead of a newly allocated array.
+    """
+    if temp_frame.dtype == np.uint16:
+        convert = load_numba_converter()
+        if convert is not None:
+            return convert(temp_frame) if out is None else convert(temp_frame, out=out)
+    if out is None:
+        return temp_frame.astype(np.float32, copy=False) * TEMP_SCALE - KELVIN_OFFSET
+    np.multiply(temp_frame, TEMP_SCALE, out=out, casting='unsafe')
+    np.subtract(out, KELVIN_OFFSET, out=out)
+    return out
+
+
+# Size of the text overlay drawn onto the OpenCV thermal view
+OVERLAY_SHAPE = (70, 400)
+
+
+@functools.lru_cache(maxsize=256)
+def text_overlay(center_temp, lo, hi):
+    """Render the temperature readout once per distinct (center, min, max)
+    
+    Returns (overlay, mask): the BGR text image and a mask of its drawn
+    pixels. Callers pass values rounded to the 0.1°C that is displayed, so
+    readings that look the same reuse the rendered text.
+    """
+    cv2 = load_cv2()
+    overlay = np.zeros(OVERLAY_SHAPE + (3,), dtype=np.uint8)
+    cv2.putText(overlay, f"Center: {center_temp:.1f}C", 
+               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    cv2.putText(overlay, f"Range: {lo:.1f}-{hi:.1f}C", 
+               (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    mask = overlay.any(axis=2, keepdims=True)
+    return overlay, mask
 
 
 class ThermalCameraDemo:
-    def __init__(self):
-        self.camera = tiny_thermal_camera.ThermalCamera()
-        self.temp_processor = tiny_thermal_camera.TemperatureProcessor()
+    def __init__(self, args=None):
+        # Options from parse_args(); defaults match running with no flags
+        self.monitor_seconds = getattr(args, 'monitor_seconds', 0)
+        self.visualize = getattr(args, 'visualize', True)
+        
+        self.ttc = load_camera_module()
+        self.camera = self.ttc.ThermalCamera()
+        self.temp_processor = self.ttc.TemperatureProcessor()
+        
+        # JET colormap as a 256-entry BGR lookup table, built on first display
+        self._jet_lut = None
+        
+        # Reused Celsius frame, (re)allocated when the frame shape changes
+        self._celsius_buf = None
         
     def initialize_camera(self):
         """Initialize and open the thermal camera"""
@@ -79,28 +181,46 @@ class ThermalCameraDemo:
         return True
     
     def capture_single_frame(self):
-        """Capture and analyze a single frame"""
+        """Capture and analyze a single frame
+        
+        Returns (temp_frame, image_frame, temp_celsius, stats) where stats is
+        (min, max, center) in Celsius, or all None on failure.
+        """
         print("\n=== Capturing Single Frame ===")
         
         # Get temperature frame
         temp_frame = self.camera.get_temperature_frame()
         if temp_frame.size == 0:
             print("Error: Failed to get temperature frame")
-            return
+            return None, None, None, None
+        temp_frame = as_frame(temp_frame)
+        
+        # Reduce the raw frame once; the conversion is monotonic, so the
+        # Celsius extremes are just the converted raw extremes
+        height, width = temp_frame.shape
+        raw_min, raw_max = int(temp_frame.min()), int(temp_frame.max())
+        raw_center = int(temp_frame[height//2, width//2])
+        stats = tuple(self.ttc.temp_to_celsius(value) for value in (raw_min, raw_max, raw_center))
         
         print(f"Temperature frame shape: {temp_frame.shape}")
-        print(f"Temperature range: {temp_frame.min()} - {temp_frame.max()} (raw values)")
+        print(f"Temperature range: {raw_min} - {raw_max} (raw values)")
+        print(f"Temperature range: {stats[0]:.1f}°C - {stats[1]:.1f}°C")
         
         # Convert raw values to Celsius for display
-        temp_celsius = np.vectorize(tiny_thermal_camera.temp_to_celsius)(temp_frame)
-        print(f"Temperature range: {temp_celsius.min():.1f}°C - {temp_celsius.max():.1f}°C")
+        temp_celsius = self.to_celsius(temp_frame)
         
         # Get image frame if available
         image_frame = self.camera.get_image_frame()
         if image_frame.size > 0:
             print(f"Image frame shape: {image_frame.shape}")
         
-        return temp_frame, image_frame, temp_celsius
+        return temp_frame, image_frame, temp_celsius, stats
+    
+    def to_celsius(self, temp_frame):
+        """Convert a raw frame to Celsius into the reused frame buffer"""
+        if self._celsius_buf is None or self._celsius_buf.shape != temp_frame.shape:
+            self._celsius_buf = np.empty(temp_frame.shape, dtype=np.float32)
+        return raw_to_celsius(temp_frame, out=self._celsius_buf)
     
     def analyze_temperatures(self, temp_frame):
         """Analyze temperatures at specific points and areas"""
@@ -109,38 +229,55 @@ class ThermalCameraDemo:
         height, width = temp_frame.shape
         center_x, center_y = width // 2, height // 2
         
-        # Point temperature
-        success, temp = self.temp_processor.get_point_temp(temp_frame, center_x, center_y)
-        if success:
-            print(f"Center point ({center_x}, {center_y}): {temp:.1f}°C")
-        
-        # Rectangle temperature (central 50x50 area)
+        # Central 50x50 area and horizontal line through center
         rect_size = min(50, width//4, height//4)
         rect_x = center_x - rect_size//2
         rect_y = center_y - rect_size//2
         
-        success, max_temp, min_temp, avg_temp = self.temp_processor.get_rect_temp(
-            temp_frame, rect_x, rect_y, rect_size, rect_size
-        )
+        # Measure the point, rectangle and line in one call into the extension
+        # when it provides analyze_batch; older builds take three calls
+        ops = [
+            ('point', center_x, center_y),
+            ('rect', rect_x, rect_y, rect_size, rect_size),
+            ('line', 0, center_y, width-1, center_y),
+        ]
+        if hasattr(self.temp_processor, 'analyze_batch'):
+            point_res, rect_res, line_res = self.temp_processor.analyze_batch(temp_frame, ops)
+        else:
+            point_res = self.temp_processor.get_point_temp(temp_frame, *ops[0][1:])
+            rect_res = self.temp_processor.get_rect_temp(temp_frame, *ops[1][1:])
+            line_res = self.temp_processor.get_line_temp(temp_frame, *ops[2][1:])
+        
+        # Point temperature
+        success, temp = point_res
+        if success:
+            print(f"Center point ({center_x}, {center_y}): {temp:.1f}°C")
+        
+        # Rectangle temperature
+        success, max_temp, min_temp, avg_temp = rect_res
         if success:
             print(f"Central {rect_size}x{rect_size} area:")
             print(f"  Max: {max_temp:.1f}°C, Min: {min_temp:.1f}°C, Avg: {avg_temp:.1f}°C")
         
-        # Line temperature (horizontal line through center)
-        success, max_temp, min_temp, avg_temp = self.temp_processor.get_line_temp(
-            temp_frame, 0, center_y, width-1, center_y
-        )
+        # Line temperature
+        success, max_temp, min_temp, avg_temp = line_res
         if success:
             print(f"Horizontal center line:")
             print(f"  Max: {max_temp:.1f}°C, Min: {min_temp:.1f}°C, Avg: {avg_temp:.1f}°C")
     
-    def visualize_thermal_data(self, temp_celsius, image_frame):
-        """Visualize thermal data using matplotlib and opencv"""
-        if not MATPLOTLIB_AVAILABLE and not OPENCV_AVAILABLE:
+    def visualize_thermal_data(self, temp_celsius, image_frame, stats=None):
+        """Visualize thermal data using matplotlib and opencv
+        
+        stats is the optional (min, max, center) Celsius tuple from
+        capture_single_frame, used instead of re-reducing the frame.
+        """
+        plt = load_pyplot()
+        cv2 = load_cv2()
+        if plt is None and cv2 is None:
             print("No visualization libraries available.")
             return
         
-        if MATPLOTLIB_AVAILABLE:
+        if plt is not None:
             # Create thermal visualization
             fig, axes = plt.subplots(1, 2 if image_frame.size > 0 else 1, figsize=(12, 5))
             if image_frame.size == 0:
@@ -157,7 +294,7 @@ class ThermalCameraDemo:
             if image_frame.size > 0:
                 # Convert BGR to RGB for matplotlib
                 if len(image_frame.shape) == 3:
-                    image_rgb = cv2.cvtColor(image_frame, cv2.COLOR_BGR2RGB)
+                    image_rgb = image_frame[..., ::-1]
                     axes[1].imshow(image_rgb)
                 else:
                     axes[1].imshow(image_frame, cmap='gray')
@@ -168,19 +305,30 @@ class ThermalCameraDemo:
             plt.tight_layout()
             plt.show()
         
-        if OPENCV_AVAILABLE:
-            # Create OpenCV visualization
-            # Normalize thermal data for display
-            temp_normalized = cv2.normalize(temp_celsius, None, 0, 255, cv2.NORM_MINMAX)
-            temp_colored = cv2.applyColorMap(temp_normalized.astype(np.uint8), cv2.COLORMAP_JET)
+        if cv2 is not None:
+            if self._jet_lut is None:
+                gray_ramp = np.arange(256, dtype=np.uint8).reshape(256, 1)
+                self._jet_lut = cv2.applyColorMap(gray_ramp, cv2.COLORMAP_JET).reshape(256, 3)
             
-            # Add temperature text overlay
+            # Create OpenCV visualization
+            # Normalize thermal data to 0-255 and colorize with one LUT gather
             height, width = temp_celsius.shape
-            center_temp = temp_celsius[height//2, width//2]
-            cv2.putText(temp_colored, f"Center: {center_temp:.1f}C", 
-                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            cv2.putText(temp_colored, f"Range: {temp_celsius.min():.1f}-{temp_celsius.max():.1f}C", 
-                       (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            if stats is not None:
+                lo, hi, center_temp = stats
+            else:
+                lo, hi = float(temp_celsius.min()), float(temp_celsius.max())
+                center_temp = temp_celsius[height//2, width//2]
+            scale = 255.0 / max(hi - lo, 1e-6)
+            temp_index = np.clip((temp_celsius - lo) * scale, 0, 255).astype(np.uint8)
+            temp_colored = self._jet_lut[temp_index]
+            
+            # Add temperature text overlay, copying only the drawn pixels
+            # (clipped to the frame, which may be narrower than the overlay)
+            overlay, mask = text_overlay(round(float(center_temp), 1),
+                                         round(lo, 1), round(hi, 1))
+            rows, cols = min(height, OVERLAY_SHAPE[0]), min(width, OVERLAY_SHAPE[1])
+            np.copyto(temp_colored[:rows, :cols], overlay[:rows, :cols],
+                      where=mask[:rows, :cols])
             
             cv2.imshow('Thermal Camera', temp_colored)
             
@@ -198,6 +346,8 @@ class ThermalCameraDemo:
         
         start_time = time.time()
         frame_count = 0
+        report_interval = 10
+        t_prev = time.perf_counter()
         
         try:
             while time.time() - start_time < duration:
@@ -205,22 +355,33 @@ class ThermalCameraDemo:
                 if temp_frame.size == 0:
                     time.sleep(0.1)
                     continue
+                temp_frame = as_frame(temp_frame)
                 
                 frame_count += 1
                 
                 # Analyze every 10th frame
-                if frame_count % 10 == 0:
-                    temp_celsius = np.vectorize(tiny_thermal_camera.temp_to_celsius)(temp_frame)
+                if frame_count % report_interval == 0:
+                    # The raw->Celsius mapping is monotonic, so reduce the raw
+                    # frame and convert only the three values we print
                     height, width = temp_frame.shape
-                    center_temp = temp_celsius[height//2, width//2]
+                    center_temp = self.ttc.temp_to_celsius(int(temp_frame[height//2, width//2]))
+                    min_temp = self.ttc.temp_to_celsius(int(temp_frame.min()))
+                    max_temp = self.ttc.temp_to_celsius(int(temp_frame.max()))
+                    
+                    # Achieved frame rate since the previous report
+                    t_now = time.perf_counter()
+                    current_fps = report_interval / (t_now - t_prev)
+                    t_prev = t_now
                     
                     elapsed = time.time() - start_time
                     print(f"[{elapsed:6.1f}s] Frame {frame_count:4d}: "
                           f"Center={center_temp:6.1f}°C, "
-                          f"Min={temp_celsius.min():6.1f}°C, "
-                          f"Max={temp_celsius.max():6.1f}°C")
+                          f"Min={min_temp:6.1f}°C, "
+                          f"Max={max_temp:6.1f}°C, "
+                          f"FPS={current_fps:5.1f}")
                 
-                time.sleep(0.1)  # Limit frame rate
+                # No throttling here: get_temperature_frame() already paces
+                # the loop at the camera's frame rate
                 
         except KeyboardInterrupt:
             print("\nMonitoring stopped by user")
@@ -245,20 +406,15 @@ class ThermalCameraDemo:
                 return False
             
             # Capture and analyze single frame
-            temp_frame, image_frame, temp_celsius = self.capture_single_frame()
+            temp_frame, image_frame, temp_celsius, stats = self.capture_single_frame()
             if temp_frame is not None:
                 self.analyze_temperatures(temp_frame)
-                self.visualize_thermal_data(temp_celsius, image_frame)
+                if self.visualize:
+                    self.visualize_thermal_data(temp_celsius, image_frame, stats)
             
             # Continuous monitoring
-            response = input("\nRun continuous monitoring? (y/N): ").lower()
-            if response.startswith('y'):
-                duration = input("Duration in seconds (default 30): ")
-                try:
-                    duration = int(duration) if duration else 30
-                except ValueError:
-                    duration = 30
-                self.continuous_monitoring(duration)
+            if self.monitor_seconds > 0:
+                self.continuous_monitoring(self.monitor_seconds)
             
             return True
             
@@ -276,9 +432,22 @@ class ThermalCameraDemo:
             print("Demo completed.")
 
 
+def parse_args(argv=None):
+    """Parse command line options for the demo"""
+    parser = argparse.ArgumentParser(description="Thermal Camera Python Demo")
+    parser.add_argument('--monitor-seconds', type=int, default=0, metavar='N',
+                        help="run continuous monitoring for N seconds (default: 0, skip)")
+    parser.add_argument('--visualize', dest='visualize', action='store_true',
+                        help="show the captured frame (default)")
+    parser.add_argument('--no-visualize', dest='visualize', action='store_false',
+                        help="skip the matplotlib/OpenCV windows")
+    parser.set_defaults(visualize=True)
+    return parser.parse_args(argv)
+
+
 def main():
     """Main entry point"""
-    demo = ThermalCameraDemo()
+    demo = ThermalCameraDemo(parse_args())
     success = demo.run_demo()
     
     if not success:
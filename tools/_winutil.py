@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Windows helpers shared by install_driver.py and troubleshoot.py
+"""
+
+import atexit
+import concurrent.futures
+import contextlib
+import queue
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+# PowerShell 7 starts noticeably faster than Windows PowerShell 5.1, so use it when installed
+_PS_EXE = shutil.which('pwsh') or shutil.which('powershell') or 'powershell'
+
+# Every PowerShell launch starts with this: skip the user's profile (often
+# hundreds of ms) and never stop to prompt
+_PS_BASE_CMD = [_PS_EXE, '-NoProfile', '-NonInteractive']
+
+# Longest single wait for output, so Ctrl-C is noticed promptly (on Windows a
+# blocked queue wait can't be interrupted)
+_POLL_INTERVAL = 0.25
+
+# Echoed after every script so the reader knows where its output ends
+_END_MARKER = '<<<END>>>'
+
+class PSHost:
+    """A single PowerShell session that queries are piped into
+
+    Starting PowerShell takes around a second, so one session is started
+    on first use and every later query reuses it.
+    """
+    _instance = None
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            _PS_BASE_CMD + ['-NoLogo', '-Command', '-'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True
+        )
+        self.lock = threading.Lock()
+
+        # Output is read on a thread so run() can give up after a timeout
+        self.lines = queue.Queue()
+        threading.Thread(target=self._read_output, daemon=True).start()
+
+    def _read_output(self):
+        for line in self.proc.stdout:
+            self.lines.put(line)
+        self.lines.put(None)  # Session ended
+
+    @classmethod
+    def instance(cls):
+        """Return the shared session, starting it if needed"""
+        if cls._instance is None or cls._instance.proc.poll() is not None:
+            cls._instance = cls()
+        return cls._instance
+
+    def run(self, script, timeout=10):
+        """Run a one-line script in the session and return its output"""
+        with self.lock:
+            self.proc.stdin.write(f"{script}\n'{_END_MARKER}'\n")
+            self.proc.stdin.flush()
+
+            deadline = time.monotonic() + timeout
+            output = []
+            try:
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise subprocess.TimeoutExpired(script, timeout)
+                    try:
+                        line = self.lines.get(timeout=min(remaining, _POLL_INTERVAL))
+                    except queue.Empty:
+                        continue
+                    if line is None:
+                        raise RuntimeError("PowerShell session exited unexpectedly")
+                    if line.rstrip('\n') == _END_MARKER:
+                        return ''.join(output)
+                    output.append(line)
+            except (subprocess.TimeoutExpired, KeyboardInterrupt):
+                # The session is stuck mid-script; kill it rather than reuse it
+                self.proc.kill()
+                self.proc.wait()
+                raise
+
+    def close(self):
+        """End the session"""
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+            self.proc.wait()
+
+    @classmethod
+    def shutdown(cls):
+        """Close the shared session, if one was started"""
+        if cls._instance is not None:
+            cls._instance.close()
+            cls._instance = None
+
+    @classmethod
+    def abort(cls):
+        """Kill the shared session at once, even while another thread is mid-query
+
+        The query in progress then fails with RuntimeError instead of waiting
+        out its timeout; the next query starts a fresh session.
+        """
+        if cls._instance is not None:
+            cls._instance.proc.kill()
+            cls._instance.proc.wait()
+            cls._instance = None
+
+atexit.register(PSHost.shutdown)
+
+@contextlib.contextmanager
+def abort_queries_on_interrupt():
+    """Kill PowerShell if Ctrl-C arrives while the block runs
+
+    Ctrl-C is only raised in the main thread, so a query running on an
+    executor worker never sees it; without this the executor's exit would
+    wait out the query's full timeout.
+    """
+    try:
+        yield
+    except KeyboardInterrupt:
+        PSHost.abort()
+        raise
+
+def wait_for_query(future):
+    """Return a background query's result, waking regularly so Ctrl-C is noticed"""
+    while True:
+        try:
+            return future.result(timeout=_POLL_INTERVAL)
+        except concurrent.futures.TimeoutError:
+            continue
+
+# Every field either tool looks at, fetched for the camera (VID_0BDA, PID_5840)
+# in one query. WMI applies the filter itself, so only matching entries are
+# serialized back instead of every PnP device on the system
+DEVICE_QUERY = (
+    "Get-CimInstance -ClassName Win32_PnPEntity -Filter \"DeviceID LIKE '%VID_0BDA&PID_5840%'\" | " +
+    "Select-Object Name, Status, Service, Manufacturer, DeviceID | Format-List"
+)
+
+# Format-List labels -> keys of the parsed device dicts
+_DEVICE_FIELDS = {
+    'Name': 'friendly_name',
+    'Status': 'status',
+    'Service': 'service',
+    'Manufacturer': 'manufacturer',
+    'DeviceID': 'instance_id',
+}
+
+# A "Label : value" line for one of those fields, matched in a single pass
+_FIELD_RE = re.compile(r'^(%s)\s*:(.*)$' % '|'.join(_DEVICE_FIELDS))
+
+_device_query = None
+
+def parse_device_list(output):
+    """Parse Format-List output into one dict per device"""
+    devices = []
+    device = None
+    key = None
+    for line in output.splitlines():
+        text = line.strip()
+        if not text:
+            device = key = None
+            continue
+
+        match = _FIELD_RE.match(line)
+        if match:
+            if device is None:
+                device = dict.fromkeys(_DEVICE_FIELDS.values(), '')
+                devices.append(device)
+            key = _DEVICE_FIELDS[match.group(1)]
+            device[key] = match.group(2).strip()
+        elif device is not None and key is not None:
+            # Long values wrap onto indented continuation lines
+            device[key] += text
+    return devices
+
+def query_device(refresh=False, timeout=10):
+    """Return (output, devices) for the camera's PnP entries
+
+    The query runs once and its result is reused; pass refresh=True when the
+    device or its driver may have changed (e.g. after installing a driver).
+    """
+    global _device_query
+    if refresh or _device_query is None:
+        output = PSHost.instance().run(DEVICE_QUERY, timeout=timeout)
+        _device_query = (output, parse_device_list(output))
+    return _device_query
+
+def forget_device_query():
+    """Drop the cached query result so the next query_device() runs again"""
+    global _device_query
+    _device_query = None
+
+# SetupAPI / Configuration Manager constants
+_DIGCF_PRESENT = 0x02
+_DIGCF_ALLCLASSES = 0x04
+_ERROR_NO_MORE_ITEMS = 259
+_SPDRP_DEVICEDESC = 0x00
+_SPDRP_SERVICE = 0x04
+_SPDRP_MFG = 0x0B
+_SPDRP_FRIENDLYNAME = 0x0C
+_DN_STARTED = 0x08
+
+def enum_usb_devices_native(vid=0x0BDA, pid=0x5840):
+    """List PnP entries for a USB VID/PID straight from SetupAPI
+
+    Returns dicts shaped like parse_device_list() output, in a few ms rather
+    than a PowerShell round-trip. Raises OSError (or AttributeError off
+    Windows) if SetupAPI can't be used, so callers can fall back to
+    query_device().
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    class SP_DEVINFO_DATA(ctypes.Structure):
+        _fields_ = [
+            ('cbSize', wintypes.DWORD),
+            ('ClassGuid', ctypes.c_byte * 16),
+            ('DevInst', wintypes.DWORD),
+            ('Reserved', ctypes.c_void_p),
+        ]
+
+    setupapi = ctypes.WinDLL('setupapi', use_last_error=True)
+    cfgmgr32 = ctypes.WinDLL('cfgmgr32')
+
+    setupapi.SetupDiGetClassDevsW.restype = ctypes.c_void_p
+    setupapi.SetupDiGetClassDevsW.argtypes = [
+        ctypes.c_void_p, wintypes.LPCWSTR, wintypes.HWND, wintypes.DWORD]
+    setupapi.SetupDiEnumDeviceInfo.argtypes = [
+        ctypes.c_void_p, wintypes.DWORD, ctypes.POINTER(SP_DEVINFO_DATA)]
+    setupapi.SetupDiGetDeviceInstanceIdW.argtypes = [
+        ctypes.c_void_p, ctypes.POINTER(SP_DEVINFO_DATA), wintypes.LPWSTR,
+        wintypes.DWORD, ctypes.POINTER(wintypes.DWORD)]
+    setupapi.SetupDiGetDeviceRegistryPropertyW.argtypes = [
+        ctypes.c_void_p, ctypes.POINTER(SP_DEVINFO_DATA), wintypes.DWORD,
+        ctypes.POINTER(wintypes.DWORD), ctypes.c_void_p, wintypes.DWORD,
+        ctypes.POINTER(wintypes.DWORD)]
+    setupapi.SetupDiDestroyDeviceInfoList.argtypes = [ctypes.c_void_p]
+
+    # Every present device node enumerated by the USB bus driver
+    hdev = setupapi.SetupDiGetClassDevsW(None, 'USB', None, _DIGCF_PRESENT | _DIGCF_ALLCLASSES)
+    if hdev is None or hdev == ctypes.c_void_p(-1).value:
+        raise ctypes.WinError(ctypes.get_last_error())
+
+    def registry_property(devinfo, prop):
+        buf = ctypes.create_unicode_buffer(512)
+        if setupapi.SetupDiGetDeviceRegistryPropertyW(
+                hdev, ctypes.byref(devinfo), prop, None, buf, ctypes.sizeof(buf), None):
+            return buf.value
+        return ''
+
+    match = f'VID_{vid:04X}&PID_{pid:04X}'
+    devices = []
+    try:
+        index = 0
+        while True:
+            devinfo = SP_DEVINFO_DATA()
+            devinfo.cbSize = ctypes.sizeof(SP_DEVINFO_DATA)
+            if not setupapi.SetupDiEnumDeviceInfo(hdev, index, ctypes.byref(devinfo)):
+                error = ctypes.get_last_error()
+                if error == _ERROR_NO_MORE_ITEMS:
+                    break
+                raise ctypes.WinError(error)
+            index += 1
+
+            instance_id = ctypes.create_unicode_buffer(512)
+            if not setupapi.SetupDiGetDeviceInstanceIdW(
+                    hdev, ctypes.byref(devinfo), instance_id, len(instance_id), None):
+                continue
+            if match not in instance_id.value.upper():
+                continue
+
+            status, problem = wintypes.ULONG(), wintypes.ULONG()
+            started = (cfgmgr32.CM_Get_DevNode_Status(
+                ctypes.byref(status), ctypes.byref(problem), devinfo.DevInst, 0) == 0
+                and status.value & _DN_STARTED and not problem.value)
+
+            devices.append({
+                'friendly_name': (registry_property(devinfo, _SPDRP_FRIENDLYNAME) or
+                                  registry_property(devinfo, _SPDRP_DEVICEDESC)),
+                'status': 'OK' if started else 'Error',
+                'service': registry_property(devinfo, _SPDRP_SERVICE),
+                'manufacturer': registry_property(devinfo, _SPDRP_MFG),
+                'instance_id': instance_id.value,
+            })
+    finally:
+        setupapi.SetupDiDestroyDeviceInfoList(hdev)
+    return devices
+
+def format_device_list(devices):
+    """Render device dicts in the same Format-List layout PowerShell prints"""
+    labels = {key: label for label, key in _DEVICE_FIELDS.items()}
+    width = max(len(label) for label in labels.values())
+    blocks = ['\n'.join(f"{labels[key]:<{width}} : {value}" for key, value in device.items())
+              for device in devices]
+    return '\n\n' + '\n\n'.join(blocks) + '\n' if blocks else ''
+
+# Device arrival notifications
+_WM_DEVICECHANGE = 0x0219
+_WM_TIMER = 0x0113
+_DBT_DEVICEARRIVAL = 0x8000
+_DBT_DEVTYP_DEVICEINTERFACE = 0x05
+_DEVICE_NOTIFY_WINDOW_HANDLE = 0x00
+_HWND_MESSAGE = -3
+
+def wait_for_device_arrival(vid=0x0BDA, pid=0x5840, timeout=60):
+    """Block until a USB device with this VID/PID is plugged in
+
+    Windows sends WM_DEVICECHANGE to a hidden message-only window the moment
+    the device arrives, so the device list is never polled. Returns False if
+    it hasn't arrived within timeout seconds. Raises OSError (or
+    AttributeError off Windows) if the notification can't be set up.
+    """
+    import ctypes
+    from ctypes import wintypes
+
+    LRESULT = ctypes.c_ssize_t
+    WNDPROC = ctypes.WINFUNCTYPE(LRESULT, wintypes.HWND, wintypes.UINT,
+                                 wintypes.WPARAM, wintypes.LPARAM)
+
+    class WNDCLASSW(ctypes.Structure):
+        _fields_ = [
+            ('style', wintypes.UINT),
+            ('lpfnWndProc', WNDPROC),
+            ('cbClsExtra', ctypes.c_int),
+            ('cbWndExtra', ctypes.c_int),
+            ('hInstance', wintypes.HINSTANCE),
+            ('hIcon', wintypes.HICON),
+            ('hCursor', wintypes.HANDLE),
+            ('hbrBackground', wintypes.HBRUSH),
+            ('lpszMenuName', wintypes.LPCWSTR),
+            ('lpszClassName', wintypes.LPCWSTR),
+        ]
+
+    class GUID(ctypes.Structure):
+        _fields_ = [
+            ('Data1', wintypes.DWORD),
+            ('Data2', wintypes.WORD),
+            ('Data3', wintypes.WORD),
+            ('Data4', ctypes.c_ubyte * 8),
+        ]
+
+    class DEV_BROADCAST_DEVICEINTERFACE_W(ctypes.Structure):
+        _fields_ = [
+            ('dbcc_size', wintypes.DWORD),
+            ('dbcc_devicetype', wintypes.DWORD),
+            ('dbcc_reserved', wintypes.DWORD),
+            ('dbcc_classguid', GUID),
+            ('dbcc_name', wintypes.WCHAR * 1),
+        ]
+
+    user32 = ctypes.WinDLL('user32', use_last_error=True)
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+
+    kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+    kernel32.GetModuleHandleW.argtypes = [wintypes.LPCWSTR]
+    user32.DefWindowProcW.restype = LRESULT
+    user32.DefWindowProcW.argtypes = [
+        wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM]
+    user32.RegisterClassW.restype = wintypes.ATOM
+    user32.RegisterClassW.argtypes = [ctypes.POINTER(WNDCLASSW)]
+    user32.UnregisterClassW.argtypes = [wintypes.LPCWSTR, wintypes.HINSTANCE]
+    user32.CreateWindowExW.restype = wintypes.HWND
+    user32.CreateWindowExW.argtypes = [
+        wintypes.DWORD, wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD,
+        ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+        wintypes.HWND, wintypes.HMENU, wintypes.HINSTANCE, wintypes.LPVOID]
+    user32.DestroyWindow.argtypes = [wintypes.HWND]
+    user32.RegisterDeviceNotificationW.restype = wintypes.HANDLE
+    user32.RegisterDeviceNotificationW.argtypes = [
+        wintypes.HANDLE, wintypes.LPVOID, wintypes.DWORD]
+    user32.UnregisterDeviceNotification.argtypes = [wintypes.HANDLE]
+    user32.SetTimer.restype = ctypes.c_size_t
+    user32.SetTimer.argtypes = [wintypes.HWND, ctypes.c_size_t, wintypes.UINT, ctypes.c_void_p]
+    user32.GetMessageW.argtypes = [
+        ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT]
+    user32.DispatchMessageW.argtypes = [ctypes.POINTER(wintypes.MSG)]
+    user32.PostQuitMessage.argtypes = [ctypes.c_int]
+
+    match = f'VID_{vid:04X}&PID_{pid:04X}'
+    name_offset = DEV_BROADCAST_DEVICEINTERFACE_W.dbcc_name.offset
+    arrived = []
+
+    def window_proc(hwnd, msg, wparam, lparam):
+        if msg == _WM_DEVICECHANGE and wparam == _DBT_DEVICEARRIVAL and lparam:
+            broadcast = DEV_BROADCAST_DEVICEINTERFACE_W.from_address(lparam)
+            # dbcc_name is a device path such as \\?\USB#VID_0BDA&PID_5840#...
+            if (broadcast.dbcc_devicetype == _DBT_DEVTYP_DEVICEINTERFACE and
+                    match in ctypes.wstring_at(lparam + name_offset).upper()):
+                arrived.append(True)
+                user32.PostQuitMessage(0)
+        return user32.DefWindowProcW(hwnd, msg, wparam, lparam)
+
+    # Kept referenced until the window is gone
+    callback = WNDPROC(window_proc)
+    hinstance = kernel32.GetModuleHandleW(None)
+    class_name = 'TinyThermalDeviceWatcher'
+
+    wndclass = WNDCLASSW()
+    wndclass.lpfnWndProc = callback
+    wndclass.hInstance = hinstance
+    wndclass.lpszClassName = class_name
+    if not user32.RegisterClassW(ctypes.byref(wndclass)):
+        raise ctypes.WinError(ctypes.get_last_error())
+
+    try:
+        hwnd = user32.CreateWindowExW(0, class_name, None, 0, 0, 0, 0, 0,
+                                      _HWND_MESSAGE, None, hinstance, None)
+        if not hwnd:
+            raise ctypes.WinError(ctypes.get_last_error())
+
+        try:
+            # Only arrivals of USB device interfaces (GUID_DEVINTERFACE_USB_DEVICE)
+            notify_filter = DEV_BROADCAST_DEVICEINTERFACE_W()
+            notify_filter.dbcc_size = ctypes.sizeof(DEV_BROADCAST_DEVICEINTERFACE_W)
+            notify_filter.dbcc_devicetype = _DBT_DEVTYP_DEVICEINTERFACE
+            notify_filter.dbcc_classguid = GUID(
+                0xA5DCBF10, 0x6530, 0x11D2,
+                (ctypes.c_ubyte * 8)(0x90, 0x1F, 0x00, 0xC0, 0x4F, 0xB9, 0x51, 0xED))
+            notification = user32.RegisterDeviceNotificationW(
+                hwnd, ctypes.byref(notify_filter), _DEVICE_NOTIFY_WINDOW_HANDLE)
+            if not notification:
+                raise ctypes.WinError(ctypes.get_last_error())
+
+            try:
+                # A short repeating timer wakes GetMessageW so the deadline and
+                # Ctrl-C are handled here; a KeyboardInterrupt raised inside
+                # window_proc would be printed and dropped by ctypes
+                user32.SetTimer(hwnd, 1, int(_POLL_INTERVAL * 1000), None)
+                deadline = time.monotonic() + timeout
+                msg = wintypes.MSG()
+                while not arrived and time.monotonic() < deadline:
+                    if user32.GetMessageW(ctypes.byref(msg), None, 0, 0) <= 0:
+                        break
+                    if msg.message != _WM_TIMER:
+                        user32.DispatchMessageW(ctypes.byref(msg))
+            finally:
+                user32.UnregisterDeviceNotification(notification)
+        finally:
+            user32.DestroyWindow(hwnd)
+    finally:
+        user32.UnregisterClassW(class_name, hinstance)
+
+    return bool(arrived)
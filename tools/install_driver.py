@@ -8,8 +8,25 @@ Automates driver installation using Zadig on Windows.
 import sys
 import os
 import subprocess
-import urllib.request
-import tempfile
+from _winutil import (enum_usb_devices_native, format_device_list, query_device,
+                      wait_for_device_arrival)
+
+ZADIG_URL = "https://github.com/pbatard/libwdi/releases/download/v1.5.0/zadig-2.8.exe"
+
+# Rule printed above and below section titles
+_BAR = "=" * 70
+
+# How long to wait for Zadig to be closed before giving up on it (seconds)
+ZADIG_TIMEOUT = 600
+
+# How long to wait for the camera to be plugged back in (seconds)
+REPLUG_TIMEOUT = 60
+
+# Tries per download; each retry resumes from the bytes already received
+DOWNLOAD_ATTEMPTS = 3
+
+# Copy buffer for downloads; large reads mean far fewer read/write calls
+DOWNLOAD_CHUNK_SIZE = 1 << 20
 
 def is_admin():
     """Check if running with administrator privileges"""
@@ -37,20 +54,21 @@ def check_device_status():
     """Check if camera is present and what driver it has"""
     print("Checking for thermal camera...")
 
-    cmd = [
-        'powershell', '-Command',
-        "Get-PnpDevice | Where-Object {$_.InstanceId -like '*VID_0BDA&PID_5840*'} | " +
-        "Select-Object FriendlyName, Status, Service"
-    ]
-
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        if result.returncode == 0 and result.stdout.strip():
-            print(f"\n{result.stdout}")
-
-            if 'winusb' in result.stdout.lower():
+        # Ask SetupAPI directly; PowerShell is only the fallback
+        try:
+            devices = enum_usb_devices_native()
+            output = format_device_list(devices)
+        except (OSError, AttributeError):
+            output, devices = query_device(timeout=10)
+
+        if devices:
+            print(f"\n{output}")
+
+            services = [device['service'].lower() for device in devices]
+            if 'winusb' in services:
                 return 'winusb_installed'
-            elif result.stdout.strip():
+            elif any(services):
                 return 'other_driver'
             else:
                 return 'no_driver'
@@ -60,19 +78,69 @@ def check_device_status():
         print(f"Error checking device: {e}")
         return 'error'
 
+def _expected_size(response, offset):
+    """Total file size implied by a response, or None if the server doesn't say"""
+    if response.status == 206:
+        # Content-Range: bytes <start>-<end>/<total>
+        total = response.headers.get('Content-Range', '').rpartition('/')[2]
+        return int(total) if total.isdigit() else None
+    length = response.headers.get('Content-Length')
+    return int(length) if length and length.isdigit() else None
+
+def download_with_resume(url, path, attempts=DOWNLOAD_ATTEMPTS):
+    """Download url to path via a .part file, resuming it after dropped connections"""
+    import http.client
+    import shutil
+    import urllib.error
+    import urllib.request
+
+    part_path = path + '.part'
+    for attempt in range(1, attempts + 1):
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        request = urllib.request.Request(url)
+        if offset:
+            request.add_header('Range', f'bytes={offset}-')
+
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                if response.status != 206:
+                    offset = 0  # Server sent the whole file
+                total = _expected_size(response, offset)
+                with open(part_path, 'ab' if offset else 'wb') as f:
+                    shutil.copyfileobj(response, f, length=DOWNLOAD_CHUNK_SIZE)
+
+            size = os.path.getsize(part_path)
+            if total is not None and size < total:
+                raise http.client.IncompleteRead(b'', total - size)
+            os.replace(part_path, path)
+            return
+        except urllib.error.HTTPError as e:
+            if e.code != 416 or attempt == attempts:
+                raise
+            # Range not satisfiable: the partial file is unusable, start over
+            os.remove(part_path)
+        except (OSError, http.client.HTTPException) as e:
+            if attempt == attempts:
+                raise
+            print(f"  Download interrupted ({e}), resuming...")
+
 def download_zadig():
     """Download Zadig tool"""
-    zadig_url = "https://github.com/pbatard/libwdi/releases/download/v1.5.0/zadig-2.8.exe"
+    import tempfile
+
+    zadig_url = ZADIG_URL
     temp_dir = tempfile.gettempdir()
     zadig_path = os.path.join(temp_dir, "zadig.exe")
 
+    # Downloads land in zadig.exe only once complete (see download_with_resume),
+    # so an existing copy is never a truncated one
     if os.path.exists(zadig_path):
         print(f"✓ Zadig already downloaded: {zadig_path}")
         return zadig_path
 
     print(f"Downloading Zadig from: {zadig_url}")
     try:
-        urllib.request.urlretrieve(zadig_url, zadig_path)
+        download_with_resume(zadig_url, zadig_path)
         print(f"✓ Downloaded to: {zadig_path}")
         return zadig_path
     except Exception as e:
@@ -82,9 +150,9 @@ def download_zadig():
 
 def install_driver():
     """Guide user through driver installation"""
-    print("\n" + "="*70)
+    print("\n" + _BAR)
     print("  WinUSB Driver Installation")
-    print("="*70)
+    print(_BAR)
 
     # Download Zadig
     zadig_path = download_zadig()
@@ -101,42 +169,66 @@ def install_driver():
     print("  4. Click 'Install Driver' or 'Replace Driver'")
     print("  5. Wait for installation to complete (1-2 minutes)")
     print("  6. Close Zadig when done")
-    print("\n" + "="*70)
+    print("\n" + _BAR)
 
     input("\nPress Enter to launch Zadig...")
 
-    # Launch Zadig
+    # Launch Zadig and carry on as soon as it is closed
     try:
-        subprocess.Popen([zadig_path])
+        proc = subprocess.Popen([zadig_path])
         print("\n✓ Zadig launched")
-        print("\nFollow the steps above in Zadig...")
-        input("\nPress Enter when driver installation is complete...")
-        return True
+        print("\nFollow the steps above in Zadig, then close it...")
     except Exception as e:
         print(f"\n✗ Failed to launch Zadig: {e}")
         return False
 
+    try:
+        proc.wait(timeout=ZADIG_TIMEOUT)
+        return True
+    except subprocess.TimeoutExpired:
+        print(f"\n✗ Zadig was still open after {ZADIG_TIMEOUT // 60} minutes")
+        return False
+
+def winusb_ready(devices):
+    """True if one of the camera's entries is running on WinUSB"""
+    return any(device['service'].lower() == 'winusb' and device['status'].lower() == 'ok'
+               for device in devices)
+
+def wait_for_replug(timeout=REPLUG_TIMEOUT):
+    """Ask for the camera to be replugged and wait until Windows reports it"""
+    print(f"\nUnplug the camera, wait 5 seconds and plug it back in (waiting up to {timeout}s)...")
+    try:
+        arrived = wait_for_device_arrival(timeout=timeout)
+    except (OSError, AttributeError) as e:
+        print(f"  Could not watch for the camera: {e}")
+        return False
+
+    if arrived:
+        print("✓ Camera reconnected")
+    else:
+        print("  Camera was not reconnected")
+    return arrived
+
 def verify_installation():
     """Verify WinUSB driver is installed"""
-    print("\n" + "="*70)
+    print("\n" + _BAR)
     print("  Verifying Installation")
-    print("="*70)
-
-    cmd = [
-        'powershell', '-Command',
-        "Get-PnpDevice | Where-Object {$_.InstanceId -like '*VID_0BDA&PID_5840*'} | " +
-        "Select-Object FriendlyName, Status, Service, DriverProvider | Format-List"
-    ]
+    print(_BAR)
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        if result.returncode == 0 and result.stdout.strip():
-            print(result.stdout)
+        # The driver was just replaced, so don't reuse the earlier result
+        output, devices = query_device(refresh=True, timeout=10)
+        if not winusb_ready(devices) and wait_for_replug():
+            # Windows may keep the old driver until the camera is reconnected
+            output, devices = query_device(refresh=True, timeout=10)
+
+        if devices:
+            print(output)
 
-            if 'winusb' in result.stdout.lower() and 'ok' in result.stdout.lower():
-                print("="*70)
+            if winusb_ready(devices):
+                print(_BAR)
                 print("  ✅ SUCCESS! WinUSB driver is installed correctly!")
-                print("="*70)
+                print(_BAR)
                 print("\n📝 Next steps:")
                 print("  1. Unplug camera, wait 5 seconds, plug back in")
                 print("  2. Test with: python tools/troubleshoot.py")
@@ -188,9 +280,9 @@ def main():
     device_status = check_device_status()
 
     if device_status == 'not_found':
-        print("\n" + "="*70)
+        print("\n" + _BAR)
         print("  ❌ Camera Not Detected")
-        print("="*70)
+        print(_BAR)
         print("\nThe thermal camera was not detected.")
         print("\n📋 Checklist:")
         print("  □ Camera is plugged into USB port")
@@ -200,9 +292,9 @@ def main():
         return 1
 
     elif device_status == 'winusb_installed':
-        print("\n" + "="*70)
+        print("\n" + _BAR)
         print("  ✅ WinUSB Driver Already Installed!")
-        print("="*70)
+        print(_BAR)
         print("\nYour camera is already configured correctly.")
         print("\nIf you're still having issues:")
         print("  1. Unplug camera, wait 5 seconds, plug back in")
@@ -210,17 +302,17 @@ def main():
         return 0
 
     elif device_status == 'other_driver':
-        print("\n" + "="*70)
+        print("\n" + _BAR)
         print("  ⚠️  Camera Found - Driver Needs Replacement")
-        print("="*70)
+        print(_BAR)
         print("\nYour camera is using a different driver (probably libusbK).")
         print("We need to replace it with WinUSB.")
         print()
 
     elif device_status == 'no_driver':
-        print("\n" + "="*70)
+        print("\n" + _BAR)
         print("  ⚠️  Camera Found - Driver Not Installed")
-        print("="*70)
+        print(_BAR)
         print("\nYour camera needs the WinUSB driver installed.")
         print()
 
@@ -249,7 +341,7 @@ def main():
 if __name__ == "__main__":
     try:
         exit_code = main()
-        print("\n" + "="*70)
+        print("\n" + _BAR)
         input("Press Enter to exit...")
         sys.exit(exit_code)
     except KeyboardInterrupt:
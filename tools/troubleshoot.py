@@ -8,23 +8,77 @@ and guide users through common problems.
 
 import sys
 import os
+import atexit
+import functools
+import io
 import platform
 import subprocess
-import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+from _winutil import (enum_usb_devices_native, query_device, forget_device_query,
+                      abort_queries_on_interrupt, wait_for_query)
+
+# Import the camera package once; every check below reuses this handle
+try:
+    import tiny_thermal_camera as _ttc
+    _import_error = None
+except ImportError as e:
+    _ttc, _import_error = None, e
+
+class _CameraSession:
+    """One initialized ThermalCamera shared by every camera test in this run
+
+    Initializing the USB library is slow, so it is done once per run; the
+    tests still list, open and close the camera themselves.
+    """
+    _camera = None
+
+    @classmethod
+    def get(cls):
+        """Return the shared camera, or None if the camera system won't initialize"""
+        if cls._camera is None:
+            camera = _ttc.ThermalCamera()
+            if not camera.initialize():
+                return None
+            cls._camera = camera
+        return cls._camera
+
+    @classmethod
+    def close(cls):
+        """Release the camera and the USB library (e.g. before a driver change)"""
+        if cls._camera is not None:
+            cls._camera.close()
+            cls._camera = None
+
+atexit.register(_CameraSession.close)
+
+# Rules printed around section titles and device output
+_BAR = "=" * 70
+_RULE = "-" * 70
+
+MAIN_MENU_OPTIONS = (
+    "Quick Diagnostics (Recommended)",
+    "Check Driver Status (Windows)",
+    "Test Camera Connection",
+    "Install/Fix WinUSB Driver",
+    "Generate Bug Report",
+    "Open GitHub Issues Page",
+)
 
 def print_header(text):
     """Print formatted header"""
-    print("\n" + "="*70)
-    print(f"  {text}")
-    print("="*70)
+    print(f"\n{_BAR}\n  {text}\n{_BAR}")
+
+@functools.lru_cache(maxsize=None)
+def _menu_body(options):
+    """Numbered option lines for a menu, rendered once per options tuple"""
+    lines = [f"  {i}. {option}" for i, option in enumerate(options, 1)]
+    lines.append(f"  {len(options) + 1}. Exit")
+    return "\n".join(lines) + "\n"
 
 def print_menu(title, options):
     """Print a menu and get user choice"""
     print_header(title)
-    for i, option in enumerate(options, 1):
-        print(f"  {i}. {option}")
-    print(f"  {len(options) + 1}. Exit")
-    print()
+    print(_menu_body(tuple(options)))
     choice = input("Select option: ").strip()
     try:
         choice_num = int(choice)
@@ -36,24 +90,33 @@ def print_menu(title, options):
         pass
     return -1  # Invalid
 
+@functools.lru_cache(maxsize=1)
+def _sysinfo():
+    """Platform strings, looked up once (platform.platform() may run uname)"""
+    return {
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'python': sys.version,
+    }
+
 def check_python_environment():
     """Check Python version and environment"""
+    info = _sysinfo()
     print_header("Python Environment")
-    print(f"Python version: {sys.version}")
-    print(f"Platform: {platform.platform()}")
-    print(f"Architecture: {platform.machine()}")
+    print(f"Python version: {info['python']}")
+    print(f"Platform: {info['platform']}")
+    print(f"Architecture: {info['machine']}")
     print(f"Executable: {sys.executable}")
 
 def check_package_installed():
     """Check if tiny_thermal_camera is installed"""
     print_header("Checking Package Installation")
-    try:
-        import tiny_thermal_camera
+    if _ttc is not None:
         print("✅ Package 'tiny_thermal_camera' is installed")
         return True
-    except ImportError as e:
+    else:
         print("❌ Package 'tiny_thermal_camera' is NOT installed")
-        print(f"\nError: {e}")
+        print(f"\nError: {_import_error}")
         print("\nTo install:")
         print("  Option 1: pip install tiny-thermal-camera")
         print("  Option 2: python setup_crossplatform.py build_ext --inplace")
@@ -61,32 +124,38 @@ def check_package_installed():
             print("  Option 3: build_windows.bat")
         return False
 
-def check_driver_status_windows():
-    """Check Windows driver status"""
-    print_header("Checking WinUSB Driver (Windows)")
+def query_driver_status():
+    """Query the camera's PnP entries afresh, returning (output, devices)"""
+    return query_device(refresh=True, timeout=15)
 
-    cmd = [
-        'powershell', '-Command',
-        "Get-PnpDevice | Where-Object {$_.InstanceId -like '*VID_0BDA&PID_5840*'} | " +
-        "Select-Object FriendlyName, Status, Service, DriverProvider | Format-List"
-    ]
+def check_driver_status_windows(pending_query=None):
+    """Check Windows driver status
+
+    pending_query is an optional future for query_driver_status() that was
+    started earlier; otherwise the query runs now.
+    """
+    print_header("Checking WinUSB Driver (Windows)")
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
+        if pending_query is not None:
+            output, devices = wait_for_query(pending_query)
+        else:
+            output, devices = query_driver_status()
 
-        if result.returncode == 0 and result.stdout.strip():
+        if devices:
             print("Device Information:")
-            print("-" * 70)
-            print(result.stdout)
-            print("-" * 70)
+            print(_RULE)
+            print(output)
+            print(_RULE)
 
-            output_lower = result.stdout.lower()
+            working = [device for device in devices if device['status'].lower() == 'ok']
 
-            if 'winusb' in output_lower and 'ok' in output_lower:
+            if any(device['service'].lower() == 'winusb' for device in working):
                 print("\n✅ WinUSB driver is installed and device is OK")
                 return 'installed'
-            elif 'ok' in output_lower:
-                current_driver = 'libusbK' if 'libusb' in output_lower else 'unknown'
+            elif working:
+                current_driver = next((device['service'] for device in working if device['service']),
+                                      'unknown')
                 print(f"\n⚠️ Device OK but using '{current_driver}' driver (need WinUSB)")
                 return 'wrong_driver'
             else:
@@ -109,20 +178,25 @@ def test_camera_basic():
     """Run basic camera test"""
     print_header("Testing Camera Connection")
 
-    try:
-        import tiny_thermal_camera
-
-        camera = tiny_thermal_camera.ThermalCamera()
+    if _ttc is None:
+        print(f"\n  ❌ ERROR: {_import_error}")
+        return False
 
+    try:
         print("Step 1: Initializing camera system...")
-        if not camera.initialize():
+        camera = _CameraSession.get()
+        if camera is None:
             print("  ❌ FAILED: Camera system initialization failed")
             print("\n  This indicates a USB library issue")
             return False
         print("  ✅ Camera system initialized")
 
         print("\nStep 2: Getting device list...")
-        success, devices = camera.get_device_list()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Ask Windows for the camera while libusb enumerates, to tell a
+            # missing device apart from one libusb can't see
+            native = executor.submit(enum_usb_devices_native) if sys.platform == 'win32' else None
+            success, devices = camera.get_device_list()
         if not success:
             print("  ❌ FAILED: Cannot enumerate USB devices")
             return False
@@ -135,7 +209,16 @@ def test_camera_basic():
         target_found = any(d['vid'] == 0x0BDA and d['pid'] == 0x5840 for d in devices)
         if not target_found:
             print("\n  ⚠️ WARNING: Thermal camera (VID=0x0BDA, PID=0x5840) not in list")
-            print("     Camera may not be detected by the OS")
+            try:
+                os_devices = native.result() if native else None
+            except (OSError, AttributeError):
+                os_devices = None
+            if os_devices:
+                services = ', '.join(sorted({d['service'] or 'none' for d in os_devices}))
+                print(f"     Windows sees the camera (driver: {services}) but libusb cannot")
+                print("     Most likely cause: Driver issue (WinUSB not installed)")
+            else:
+                print("     Camera may not be detected by the OS")
             return False
 
         print("\nStep 3: Opening camera...")
@@ -156,87 +239,100 @@ def test_camera_basic():
         traceback.print_exc()
         return False
 
-def generate_bug_report():
-    """Generate comprehensive bug report"""
-    print_header("Generating Bug Report")
-
-    report_lines = []
-    report_lines.append("# Thermal Camera Bug Report\n")
-    report_lines.append(f"Generated: {platform.platform()}\n")
-    report_lines.append(f"Python: {sys.version}\n\n")
-
-    # System info
-    report_lines.append("## System Information\n")
-    report_lines.append(f"- OS: {platform.platform()}\n")
-    report_lines.append(f"- Python: {sys.version}\n")
-    report_lines.append(f"- Architecture: {platform.machine()}\n\n")
-
-    # Package status
-    report_lines.append("## Package Status\n")
+def _run_camera_tests():
+    """Run the bug report's camera tests and return its report lines"""
+    lines = []
     try:
-        import tiny_thermal_camera
-        report_lines.append("- Package: INSTALLED ✅\n\n")
-    except ImportError as e:
-        report_lines.append(f"- Package: NOT INSTALLED ❌\n")
-        report_lines.append(f"- Error: {e}\n\n")
-
-    # Driver status (Windows)
-    if sys.platform == 'win32':
-        report_lines.append("## Driver Status (Windows)\n")
-        cmd = ['powershell', '-Command',
-               "Get-PnpDevice | Where-Object {$_.InstanceId -like '*VID_0BDA&PID_5840*'} | " +
-               "Select-Object FriendlyName, Status, Service, DriverProvider | Format-List"]
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
-            if result.stdout.strip():
-                report_lines.append("```\n")
-                report_lines.append(result.stdout)
-                report_lines.append("```\n\n")
-            else:
-                report_lines.append("- Camera: NOT DETECTED ❌\n\n")
-        except:
-            report_lines.append("- Error checking driver status\n\n")
-
-    # Camera test
-    report_lines.append("## Camera Test Results\n")
-    print("\nRunning camera tests...")
-    try:
-        import tiny_thermal_camera
-        camera = tiny_thermal_camera.ThermalCamera()
+        if _ttc is None:
+            raise ImportError(_import_error)
+        camera = _CameraSession.get()
 
-        if camera.initialize():
-            report_lines.append("- Initialize: SUCCESS ✅\n")
+        if camera is not None:
+            lines.append("- Initialize: SUCCESS ✅\n")
             success, devices = camera.get_device_list()
             if success:
-                report_lines.append(f"- Device List: {len(devices)} device(s) ✅\n")
+                lines.append(f"- Device List: {len(devices)} device(s) ✅\n")
                 for d in devices:
-                    report_lines.append(f"  - VID=0x{d['vid']:04X}, PID=0x{d['pid']:04X}\n")
+                    lines.append(f"  - VID=0x{d['vid']:04X}, PID=0x{d['pid']:04X}\n")
             else:
-                report_lines.append("- Device List: FAILED ❌\n")
+                lines.append("- Device List: FAILED ❌\n")
 
             if camera.open():
-                report_lines.append("- Open Camera: SUCCESS ✅\n")
+                lines.append("- Open Camera: SUCCESS ✅\n")
                 camera.close()
             else:
-                report_lines.append("- Open Camera: FAILED ❌\n")
+                lines.append("- Open Camera: FAILED ❌\n")
         else:
-            report_lines.append("- Initialize: FAILED ❌\n")
+            lines.append("- Initialize: FAILED ❌\n")
     except Exception as e:
-        report_lines.append(f"- Test Error: {e}\n")
+        lines.append(f"- Test Error: {e}\n")
+    return lines
 
-    report_lines.append("\n## Additional Information\n")
-    report_lines.append("(Add any additional details about your issue here)\n\n")
+def generate_bug_report():
+    """Generate comprehensive bug report"""
+    print_header("Generating Bug Report")
+
+    info = _sysinfo()
+    report = io.StringIO()
+    report.write("# Thermal Camera Bug Report\n")
+    report.write(f"Generated: {info['platform']}\n")
+    report.write(f"Python: {info['python']}\n\n")
+
+    # System info
+    report.write("## System Information\n")
+    report.write(f"- OS: {info['platform']}\n")
+    report.write(f"- Python: {info['python']}\n")
+    report.write(f"- Architecture: {info['machine']}\n\n")
+
+    # Package status
+    report.write("## Package Status\n")
+    if _ttc is not None:
+        report.write("- Package: INSTALLED ✅\n\n")
+    else:
+        report.write(f"- Package: NOT INSTALLED ❌\n")
+        report.write(f"- Error: {_import_error}\n\n")
+
+    with ThreadPoolExecutor(max_workers=1) as executor, abort_queries_on_interrupt():
+        # A fresh driver query runs in the background while the camera is tested
+        driver_query = None
+        if sys.platform == 'win32':
+            driver_query = executor.submit(query_driver_status)
+
+        print("\nRunning camera tests...")
+        camera_lines = _run_camera_tests()
+
+        # Driver status (Windows)
+        if driver_query is not None:
+            report.write("## Driver Status (Windows)\n")
+            try:
+                output, devices = wait_for_query(driver_query)
+                if devices:
+                    report.write("```\n")
+                    report.write(output)
+                    report.write("```\n\n")
+                else:
+                    report.write("- Camera: NOT DETECTED ❌\n\n")
+            except Exception:
+                report.write("- Error checking driver status\n\n")
+
+    # Camera test
+    report.write("## Camera Test Results\n")
+    report.writelines(camera_lines)
+
+    report.write("\n## Additional Information\n")
+    report.write("(Add any additional details about your issue here)\n\n")
 
     # Save report
     report_file = "thermal_camera_bug_report.txt"
-    with open(report_file, 'w') as f:
-        f.writelines(report_lines)
+    contents = report.getvalue()
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write(contents)
 
     print(f"\n✅ Bug report saved to: {report_file}")
     print("\nReport contents:")
-    print("=" * 70)
-    print(''.join(report_lines))
-    print("=" * 70)
+    print(_BAR)
+    print(contents)
+    print(_BAR)
 
     return report_file
 
@@ -247,6 +343,7 @@ def open_github_issues():
     print(f"\nOpening GitHub issues page: {github_url}")
     print("\nPlease attach the bug report file when creating your issue.")
     try:
+        import webbrowser
         webbrowser.open(github_url)
     except:
         print(f"\nCouldn't open browser automatically. Please visit:\n{github_url}")
@@ -260,7 +357,11 @@ def run_driver_installer():
     if os.path.exists(install_script):
         print(f"Launching driver installer...\n")
         try:
+            # Let go of the camera so its driver can be replaced
+            _CameraSession.close()
             subprocess.run([sys.executable, install_script])
+            # The driver may have changed
+            forget_device_query()
         except Exception as e:
             print(f"Error running installer: {e}")
     else:
@@ -287,32 +388,29 @@ This tool helps diagnose and fix camera issues.
 """)
 
     while True:
-        choice = print_menu(
-            "Main Menu",
-            [
-                "Quick Diagnostics (Recommended)",
-                "Check Driver Status (Windows)",
-                "Test Camera Connection",
-                "Install/Fix WinUSB Driver",
-                "Generate Bug Report",
-                "Open GitHub Issues Page"
-            ]
-        )
+        choice = print_menu("Main Menu", MAIN_MENU_OPTIONS)
 
         if choice == 0:  # Exit
             print("\nGoodbye!")
             break
         elif choice == 1:  # Quick Diagnostics
-            check_python_environment()
-            pkg_ok = check_package_installed()
-            if not pkg_ok:
-                print("\n⚠️ Cannot continue diagnostics without package installed")
-                continue
-
-            if sys.platform == 'win32':
-                driver_status = check_driver_status_windows()
-                if driver_status in ['wrong_driver', 'device_error', 'not_found']:
-                    print("\n💡 TIP: Try option 4 to install/fix the WinUSB driver")
+            with ThreadPoolExecutor(max_workers=1) as executor, abort_queries_on_interrupt():
+                # Start the driver query first so PowerShell runs while the
+                # environment is printed and the package is imported
+                driver_query = None
+                if sys.platform == 'win32':
+                    driver_query = executor.submit(query_driver_status)
+
+                check_python_environment()
+                pkg_ok = check_package_installed()
+                if not pkg_ok:
+                    print("\n⚠️ Cannot continue diagnostics without package installed")
+                    continue
+
+                if driver_query is not None:
+                    driver_status = check_driver_status_windows(driver_query)
+                    if driver_status in ['wrong_driver', 'device_error', 'not_found']:
+                        print("\n💡 TIP: Try option 4 to install/fix the WinUSB driver")
 
             test_camera_basic()
 